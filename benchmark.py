@@ -0,0 +1,301 @@
+"""
+Offline benchmark of codeforcesAPI.
+
+A local stand-in for Codeforces replays fixture responses, so the library
+can be measured without network access. Each method is called through
+the client, and for each it reports calls per second, JSON decode time,
+model construction time (nested objects included) and peak memory of a
+call.
+
+    python benchmark.py --synthesize        # Generate large fixtures
+    python benchmark.py --record            # Or record them from Codeforces
+    python benchmark.py                     # Run the benchmark
+    python benchmark.py --output dicts      # Or with another output
+
+Fixtures are stored as <method>.json in the fixture directory.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import codeforcesAPI
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+
+# Methods and parameters to record from Codeforces and to benchmark
+METHODS = {
+    'contest.standings':    {'contestId': 1843, 'showUnofficial': True},
+    'contest.status':       {'contestId': 1843},
+    'user.ratedList':       {'activeOnly': False},
+    'problemset.problems':  {},
+}
+
+"""
+Fixtures
+"""
+
+def record(directory, base_url = codeforcesAPI.API_URL):
+    """
+    Downloads the response of every method in METHODS into directory.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    client = codeforcesAPI.CodeforcesClient(base_url=base_url, timeout=(10, 600))
+    for method, params in METHODS.items():
+        with client.returning('raw'):
+            ok, result = client.call(method, **params)
+        if not ok:
+            raise RuntimeError(f'{method}: {result}')
+        with open(os.path.join(directory, method + '.json'), 'wb') as f:
+            f.write(b'{"status":"OK","result":' + result + b'}')
+        print(f'{method}: {len(result) / 2**20:.1f} MB')
+    client.close()
+
+def synthesize(directory, scale = 1.0, seed = 0):
+    """
+    Writes made-up responses shaped like the real ones, for when
+    Codeforces can't be reached. scale multiplies the number of rows.
+    """
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    languages = ['GNU C++17', 'GNU C++20 (64)', 'Python 3', 'PyPy 3-64', 'Java 21', 'Rust 2021', 'Kotlin 1.9']
+    verdicts = ['OK'] * 4 + ['WRONG_ANSWER'] * 3 + ['TIME_LIMIT_EXCEEDED', 'RUNTIME_ERROR', 'COMPILATION_ERROR']
+    tags = ['math', 'greedy', 'dp', 'graphs', 'strings', 'implementation', 'brute force', 'data structures']
+    countries = ['Russia', 'China', 'India', 'Vietnam', 'Poland', 'Japan', 'United States', None]
+    handles = [f'user_{i}' for i in range(int(100000 * scale))]
+    contestId = 1843
+
+    def problem(contestId, index):
+        return {
+            'contestId': contestId, 'index': index, 'name': f'Problem {contestId}{index}',
+            'type': 'PROGRAMMING', 'points': 500.0 * ('ABCDEFG'.index(index[0]) + 1),
+            'rating': rng.randrange(800, 3600, 100), 'tags': rng.sample(tags, rng.randint(0, 3)),
+        }
+
+    def party(handle):
+        return {
+            'contestId': contestId, 'members': [{'handle': handle}], 'participantType': 'CONTESTANT',
+            'ghost': False, 'room': rng.randint(1, 500), 'startTimeSeconds': 1686839700,
+        }
+
+    problems = [problem(contestId, x) for x in 'ABCDEF']
+    rows = []
+    for rank, handle in enumerate(handles[:int(30000 * scale)], 1):
+        results = [{
+            'points': rng.choice([0.0, x['points'] * rng.uniform(0.3, 1)]),
+            'rejectedAttemptCount': rng.randint(0, 3), 'type': 'FINAL',
+            'bestSubmissionTimeSeconds': rng.randint(0, 7200),
+        } for x in problems]
+        rows.append({
+            'party': party(handle), 'rank': rank, 'points': sum(x['points'] for x in results),
+            'penalty': 0, 'successfulHackCount': rng.randint(0, 2), 'unsuccessfulHackCount': 0,
+            'problemResults': results,
+        })
+    standings = {'contest': {
+        'id': contestId, 'name': 'Codeforces Round (Div. 2)', 'type': 'CF', 'phase': 'FINISHED',
+        'frozen': False, 'durationSeconds': 7200, 'startTimeSeconds': 1686839700, 'relativeTimeSeconds': 10**7,
+    }, 'problems': problems, 'rows': rows}
+
+    submissions = []
+    for id in range(int(150000 * scale), 0, -1):
+        submissions.append({
+            'id': 210000000 + id, 'contestId': contestId, 'creationTimeSeconds': 1686839700 + id % 7200,
+            'relativeTimeSeconds': id % 7200, 'problem': rng.choice(problems),
+            'author': party(rng.choice(handles[:int(30000 * scale)])),
+            'programmingLanguage': rng.choice(languages), 'verdict': rng.choice(verdicts), 'testset': 'TESTS',
+            'passedTestCount': rng.randint(0, 80), 'timeConsumedMillis': rng.randint(0, 2000),
+            'memoryConsumedBytes': rng.randint(0, 256) * 2**20,
+        })
+
+    users = []
+    for handle in handles:
+        rating = int(rng.gauss(1400, 350))
+        users.append({
+            'handle': handle, 'rating': rating, 'maxRating': rating + rng.randint(0, 200), 'rank': 'specialist',
+            'maxRank': 'expert', 'contribution': rng.randint(-5, 20), 'country': rng.choice(countries),
+            'organization': f'University {rng.randint(1, 2000)}', 'friendOfCount': rng.randint(0, 100),
+            'lastOnlineTimeSeconds': 1700000000, 'registrationTimeSeconds': 1500000000,
+            'avatar': 'https://userpic.codeforces.org/no-avatar.jpg', 'titlePhoto': 'https://userpic.codeforces.org/no-title.jpg',
+        })
+
+    catalog = [problem(contest, index) for contest in range(1, int(1500 * scale)) for index in 'ABCDEF']
+    statistics_ = [{'contestId': x['contestId'], 'index': x['index'], 'solvedCount': rng.randint(0, 50000)} for x in catalog]
+
+    results = {
+        'contest.standings': standings,
+        'contest.status': submissions,
+        'user.ratedList': users,
+        'problemset.problems': {'problems': catalog, 'problemStatistics': statistics_},
+    }
+    for method, result in results.items():
+        with open(os.path.join(directory, method + '.json'), 'w') as f:
+            json.dump({'status': 'OK', 'result': result}, f)
+
+"""
+Stand-in server
+"""
+
+class FixtureServer:
+    """
+    Local HTTP server answering /api/<method> with <method>.json from
+    directory, whatever the parameters. Connections are kept alive like
+    on Codeforces.
+
+        with FixtureServer('bench_fixtures') as server:
+            client = CodeforcesClient(base_url=server.url, rate_limiter=None)
+    """
+
+    def __init__(self, directory):
+        self.responses = {}
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    self.responses[name[:-len('.json')]] = f.read()
+
+        responses = self.responses
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                method = self.path.split('?')[0].rsplit('/', 1)[-1]
+                body = responses.get(method)
+                if body is None:
+                    body = json.dumps({'status': 'FAILED', 'comment': f'No fixture for {method}'}).encode()
+                    self.send_response(400)
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Type', 'application/json;charset=UTF-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/api/'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+"""
+Benchmark
+"""
+
+def touch(value):
+    """
+    Reads every field of the objects in value, so that nested objects,
+    which are only built when read, are built too.
+    """
+
+    if isinstance(value, codeforcesAPI.CodeforcesObject):
+        for name in type(value).__slots__:
+            touch(getattr(value, name.lstrip('_')))
+    elif isinstance(value, (list, tuple)):
+        for x in value:
+            touch(x)
+
+def bench_method(client, method, params, repeat = 5, output = 'objects'):
+    """
+    Measures one method against the stand-in server, through client.call()
+    like an application would, so the client's decoder, output, retries
+    and listeners are all part of it.
+    Return value: A dict of median timings in seconds, calls per second,
+    response size and peak memory in bytes of a whole call.
+    """
+
+    stats = codeforcesAPI.CallStats()
+    client.add_listener(stats)
+    nested = []
+    try:
+        with client.returning(output):
+            for _ in range(repeat):
+                ok, result = client.call(method, **params)
+                if not ok:
+                    raise RuntimeError(f'{method}: {result}')
+                start = time.perf_counter()
+                touch(result)
+                nested.append(time.perf_counter() - start)
+                del result
+
+            tracemalloc.start()
+            ok, result = client.call(method, **params)
+            touch(result)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del result
+    finally:
+        client.remove_listener(stats)
+
+    events = list(stats.events[method])[:repeat]
+    median = lambda field: statistics.median(getattr(x, field) for x in events)
+    total = statistics.median(x.total + y for x, y in zip(events, nested))
+    return {
+        'bytes': events[-1].bytes,
+        'requests_per_second': 1 / total,
+        'fetch': median('latency'),
+        'decode': median('decode'),
+        'construct': median('build') + statistics.median(nested),
+        'peak_memory': peak,
+    }
+
+def run(directory, methods = None, repeat = 5, output = 'objects', decoder = None):
+    """
+    Benchmarks every method with a fixture in directory and prints a table.
+    Return value: A dict from method to its bench_method() results.
+    """
+
+    results = {}
+    with FixtureServer(directory) as server:
+        client = codeforcesAPI.CodeforcesClient(base_url=server.url, rate_limiter=None, decoder=decoder)
+        print(f'{"method":24}{"size":>10}{"req/s":>9}{"fetch":>10}{"decode":>10}{"build":>10}{"peak":>10}')
+        for method in methods or METHODS:
+            if method not in server.responses:
+                print(f'{method:24}  no fixture')
+                continue
+            r = results[method] = bench_method(client, method, METHODS.get(method, {}), repeat, output)
+            print(f'{method:24}{r["bytes"] / 2**20:>8.1f}MB{r["requests_per_second"]:>9.1f}'
+                  f'{r["fetch"] * 1e3:>8.0f}ms{r["decode"] * 1e3:>8.0f}ms{r["construct"] * 1e3:>8.0f}ms'
+                  f'{r["peak_memory"] / 2**20:>8.0f}MB')
+        client.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=FIXTURES, help='fixture directory')
+    parser.add_argument('--record', action='store_true', help='record fixtures from Codeforces first')
+    parser.add_argument('--synthesize', action='store_true', help='generate synthetic fixtures first')
+    parser.add_argument('--scale', type=float, default=1.0, help='size of synthetic fixtures')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per method')
+    parser.add_argument('--output', default='objects', choices=codeforcesAPI.OUTPUTS, help='what calls return')
+    parser.add_argument('--stdlib-json', action='store_true', help='decode with the json module instead of orjson')
+    parser.add_argument('methods', nargs='*', help='methods to benchmark (default: all)')
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.fixtures)
+    elif args.synthesize:
+        synthesize(args.fixtures, args.scale)
+    elif not os.path.isdir(args.fixtures):
+        parser.error(f'{args.fixtures} does not exist, use --synthesize or --record')
+    run(args.fixtures, args.methods, args.repeat, args.output, json.loads if args.stdlib_json else None)
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,45 @@ Every function should return a tuple of 2 things
 -   (True, ...)   = It works
 """
 
+import asyncio
+import bisect
+import codecs
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import mmap
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 """
 List of self-made simple APIs
@@ -16,32 +54,18 @@ def get_user_info(handle):
     Returns information about one user
     """
 
-    info = requests.get(f'https://codeforces.com/api/user.info?handles={handle}')
+    ok, result = default_client.user_info(handle)
+    if not ok:
+        return (False, result)
 
-    if info.status_code != 200:
-        return (False, None)
-    
-    info = info.json()
-
-    if info['status'] != 'OK':
-        return (False, info['comment'])
-    
-    return (True, User(**info['result'][0]))
+    return (True, result[0])
 
 def get_user_submissions(handle, count = 200):
     """
     Get submissions of an user
     """
 
-    info = requests.get(f'https://codeforces.com/api/user.status?handle={handle}&count={count}')
-
-    if info.status_code != 200:
-        return (0, None)
-    info = info.json()
-    if info['status'] != 'OK':
-        return (0, member_bad(info['comment']))
-
-    return (1, [Submission(**x) for x in info['result']])
+    return default_client.user_status(handle, count=count)
 
 
 """
@@ -58,16 +82,7 @@ def blogEntry_comments(blogEntryId):
     -   blogEntryId (Required): 	Id of the blog entry.
     """
 
-    url = f'https://codeforces.com/api/blogEntry.comments?blogEntryId={blogEntryId}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Comment(**x) for x in info['result']]
+    return default_client.blogEntry_comments(blogEntryId)
 
 def blogEntry_view(blogEntryId):
     """
@@ -78,16 +93,7 @@ def blogEntry_view(blogEntryId):
     -   blogEntryId (Required): 	Id of the blog entry.
     """
 
-    url = f'https://codeforces.com/api/blogEntry.view?blogEntryId={blogEntryId}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, BlogEntry(**info['result'])
+    return default_client.blogEntry_view(blogEntryId)
 
 def contest_hacks(contestId):
     """
@@ -101,16 +107,7 @@ def contest_hacks(contestId):
     -   contestId (Required): 	    Id of the contest.
     """
 
-    url = f'https://codeforces.com/api/contest.hacks?contestId={contestId}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Hack(**x) for x in info['result']]
+    return default_client.contest_hacks(contestId)
 
 def contest_list(gym = False):
     """
@@ -124,16 +121,7 @@ def contest_list(gym = False):
     -   gym: 	Boolean. If true — than gym contests are returned. Otherwide, regular contests are returned.
     """
 
-    url = f'https://codeforces.com/api/contest.list?gym=true={gym}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Contest(**x) for x in info['result']]
+    return default_client.contest_list(gym)
 
 def contest_ratingChanges(contestId):
     """
@@ -144,16 +132,7 @@ def contest_ratingChanges(contestId):
     -   contestId (Required): 	Id of the contest.
     """
 
-    url = f'https://codeforces.com/api/contest.ratingChanges?contestId={contestId}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [RatingChange(**x) for x in info['result']]
+    return default_client.contest_ratingChanges(contestId)
 
 def contest_standings(contestId, **kwargs):
     """
@@ -173,24 +152,8 @@ def contest_standings(contestId, **kwargs):
     -   showUnofficial: 	If true than all participants (virtual, out of competition) are shown. Otherwise, only official contestants are shown.
     """
 
-    url = f'https://codeforces.com/api/contest.standings?contestId={contestId}'
-    for x in kwargs:
-        url += f'&{x}={kwargs[x]}'
-    
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    result = (
-        Contest(**info['result']['contest']),
-        [Problem(**x) for x in info['result']['problems']],
-        [RanklistRow(**x) for x in info['result']['rows']]
-    )
-    return True, result
-    
+    return default_client.contest_standings(contestId, **kwargs)
+
 def contest_status(contestId, **kwargs):
     """
     Returns submissions for specified contest. Optionally can return 
@@ -204,19 +167,8 @@ def contest_status(contestId, **kwargs):
     -   from: 	1-based index of the first submission to return
     -   count: 	Number of returned submissions.
     """
-    
-    url = f' https://codeforces.com/api/contest.status?contestId={contestId}'
-    for x in kwargs:
-        url += f'&{x}={kwargs[x]}'
-    
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Submission(**x) for x in info['result']]
+
+    return default_client.contest_status(contestId, **kwargs)
 
 def problemset_problems(**kwargs):
     """
@@ -228,22 +180,7 @@ def problemset_problems(**kwargs):
     -   problemsetName: 	Custom problemset's short name, like 'acmsguru'
     """
 
-    url = 'https://codeforces.com/api/problemset.problems?'
-    for x in kwargs:
-        url += f'&{x}={kwargs[x]}'
-    
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    result = (
-        [Problem(**x) for x in info['result']['problems']],
-        [ProblemStatistics(**x) for x in info['result']['problemStatistics']]
-    )
-    return True, result
+    return default_client.problemset_problems(**kwargs)
 
 def problemset_recentStatus(count, problemsetName = None):
     """
@@ -255,18 +192,7 @@ def problemset_recentStatus(count, problemsetName = None):
     -   problemsetName: 	Custom problemset's short name, like 'acmsguru'
     """
 
-    url = f'https://codeforces.com/api/problemset.recentStatus?count={count}'
-    if problemsetName != None:
-        url += '&problemsetName={problemsetName}'
-    
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Submission(**x) for x in info['result']]
+    return default_client.problemset_recentStatus(count, problemsetName)
 
 def recentActions(maxCount):
     """
@@ -277,16 +203,7 @@ def recentActions(maxCount):
     -   maxCount (Required): 	Number of recent actions to return. Can be up to 100.
     """
 
-    url = f'https://codeforces.com/api/recentActions?maxCount={maxCount}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [RecentAction(**x) for x in info['result']]
+    return default_client.recentActions(maxCount)
 
 def user_blogEntries(handle):
     """
@@ -297,16 +214,7 @@ def user_blogEntries(handle):
     -   handle (Required): 	Codeforces user handle.
     """
 
-    url = f'https://codeforces.com/api/user.blogEntries?handle={handle}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [BlogEntry(**x) for x in info['result']]
+    return default_client.user_blogEntries(handle)
 
 def user_info(handles):
     """
@@ -318,16 +226,7 @@ def user_info(handles):
                                 more than 10000 handles is accepted.
     """
 
-    url = f'https://codeforces.com/api/user.info?handles={handles}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [User(**x) for x in info['result']]
+    return default_client.user_info(handles)
 
 def user_ratedList(activeOnly = True):
     """
@@ -341,16 +240,7 @@ def user_ratedList(activeOnly = True):
                     least one rated contest are returned.
     """
 
-    url = f'https://codeforces.com/api/user.ratedList?activeOnly={activeOnly}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [User(**x) for x in info['result']]
+    return default_client.user_ratedList(activeOnly)
 
 def user_rating(handle):
     """
@@ -361,16 +251,7 @@ def user_rating(handle):
     -   handle (Required): 	Codeforces user handle.
     """
 
-    url = f'https://codeforces.com/api/user.rating?handle={handle}'
-
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [RatingChange(**x) for x in info['result']]
+    return default_client.user_rating(handle)
 
 def user_status(handle, **kwargs):
     """
@@ -384,237 +265,3571 @@ def user_status(handle, **kwargs):
     -   count: 	Number of returned submissions.
     """
 
-    url = f'https://codeforces.com/api/user.status?handle={handle}'
-    for x in kwargs:
-        url += f'&{x}={kwargs[x]}'
-    
-    info = requests.get(url)
-    if info.status_code != 200:
-        return False, None
-    info = info.json()
-    if info['status'] != 'OK':
-        return False, info['comment']
-    
-    return True, [Submission(**x) for x in info['result']]
+    return default_client.user_status(handle, **kwargs)
 
 """
 Classes to store Codeforces's Object
 """
 class CodeforcesObject:
+    """
+    Every Codeforces object stores its fields in __slots__ rather than a
+    per-object __dict__. Fields absent from the response are None (or
+    the value in the class' _defaults), and fields Codeforces adds which
+    are not known here yet are kept in _extra.
+    """
+
+    __slots__ = ('_extra',)
+    _defaults = {}
+
+    def __init_subclass__(cls):
+        # Each class gets a generated __init__ taking its fields as keyword
+        # arguments, which is about twice as fast as setting them in a loop.
+        fields = [x for x in cls.__slots__]
+        args = ', '.join(f'{x.lstrip("_")}={cls._defaults.get(x)!r}' for x in fields)
+        body = ''.join(f'    self.{x} = {x.lstrip("_")}\n' for x in fields)
+        code = f'def __init__(self, *, {args}, **extra):\n{body}    self._extra = extra or None\n'
+        # Pickled as one flat tuple of the slots, e.g. to send objects
+        # between processes. Nested objects not read yet stay raw dicts.
+        state = ''.join(f'self.{x}, ' for x in fields) + 'self._extra'
+        code += f'def __getstate__(self):\n    return ({state})\n'
+        code += f'def __setstate__(self, state):\n    {state} = state\n'
+        namespace = {}
+        exec(code, namespace)
+        cls.__init__ = namespace['__init__']
+        cls.__getstate__ = namespace['__getstate__']
+        cls.__setstate__ = namespace['__setstate__']
+
+    def __getattr__(self, name):
+        # Only called for names which are not fields
+        if name[0] != '_' and self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
     def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
-    
+        for name in kwargs:
+            if hasattr(type(self), name):
+                setattr(self, name, kwargs[name])
+            else:
+                self._extra = dict(self._extra or {}, **{name: kwargs[name]})
+
+class _Nested:
+    """
+    Field holding a nested Codeforces object, or a list of them. It keeps
+    the raw dict from the response and only builds the object the first
+    time the field is read.
+    """
+
+    def __init__(self, cls, many = False):
+        self.cls = cls
+        self.many = many
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__['_' + name]
+
+    def __get__(self, obj, owner = None):
+        if obj is None:
+            return self
+
+        value = self.slot.__get__(obj, owner)
+        if self.many:
+            if value and type(value[0]) is dict:
+                cls = globals()[self.cls]
+                value = [cls(**x) for x in value]
+                self.slot.__set__(obj, value)
+        elif type(value) is dict:
+            value = globals()[self.cls](**value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
 class User(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.handle                 = None  # String. Codeforces user handle.
-        self.email                  = None  # String. Shown only if user allowed to share his contact info.
-        self.vkId                   = None  # String. User id for VK social network. Shown only if user allowed to share his contact info.
-        self.openId                 = None  # String. Shown only if user allowed to share his contact info.
-        self.firstName              = None  # String. Localized. Can be absent.
-        self.lastName               = None  # String. Localized. Can be absent.
-        self.country                = None  # String. Localized. Can be absent.
-        self.city                   = None  # String. Localized. Can be absent.
-        self.organization           = None  # String. Localized. Can be absent.
-        self.contribution           = None  # Integer. User contribution.
-        self.rank                   = 'unrated'  # String. Localized.
-        self.rating                 = 'unrated'  # Integer.
-        self.maxRank                = None  # String. Localized.
-        self.maxRating              = None  # Integer.
-        self.lastOnlineTimeSeconds  = None  # Integer. Time, when user was last seen online, in unix format.
-        self.registrationTimeSeconds= None  # Integer. Time, when user was registered, in unix format.
-        self.friendOfCount          = None  # Integer. Amount of users who have this user in friends.
-        self.avatar                 = None  # String. User's avatar URL.    
-        self.titlePhoto             = None  # String. User's title photo URL.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'handle',                   # String. Codeforces user handle.
+        'email',                    # String. Shown only if user allowed to share his contact info.
+        'vkId',                     # String. User id for VK social network. Shown only if user allowed to share his contact info.
+        'openId',                   # String. Shown only if user allowed to share his contact info.
+        'firstName',                # String. Localized. Can be absent.
+        'lastName',                 # String. Localized. Can be absent.
+        'country',                  # String. Localized. Can be absent.
+        'city',                     # String. Localized. Can be absent.
+        'organization',             # String. Localized. Can be absent.
+        'contribution',             # Integer. User contribution.
+        'rank',                     # String. Localized.
+        'rating',                   # Integer.
+        'maxRank',                  # String. Localized.
+        'maxRating',                # Integer.
+        'lastOnlineTimeSeconds',    # Integer. Time, when user was last seen online, in unix format.
+        'registrationTimeSeconds',  # Integer. Time, when user was registered, in unix format.
+        'friendOfCount',            # Integer. Amount of users who have this user in friends.
+        'avatar',                   # String. User's avatar URL.
+        'titlePhoto',               # String. User's title photo URL.
+    )
+    _defaults = {'rank': 'unrated', 'rating': 'unrated'}
 
 class BlogEntry(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.id                     = None  # Integer.
-        self.originalLocale         = None 	# String. Original locale of the blog entry.
-        self.creationTimeSeconds    = None  # Integer. Time, when blog entry was created, in unix format.
-        self.authorHandle           = None  # String. Author user handle.
-        self.title                  = None  # String. Localized.
-        self.content                = None  # String. Localized. Not included in short version.
-        self.locale                 = None  # String.
-        self.modificationTimeSeconds= None  # Integer. Time, when blog entry has been updated, in unix format.
-        self.allowViewHistory       = None  # Boolean. If true, you can view any specific revision of the blog entry.
-        self.tags                   = None  # String list.
-        self.rating                 = None  # Integer.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'id',                       # Integer.
+        'originalLocale',           # String. Original locale of the blog entry.
+        'creationTimeSeconds',      # Integer. Time, when blog entry was created, in unix format.
+        'authorHandle',             # String. Author user handle.
+        'title',                    # String. Localized.
+        'content',                  # String. Localized. Not included in short version.
+        'locale',                   # String.
+        'modificationTimeSeconds',  # Integer. Time, when blog entry has been updated, in unix format.
+        'allowViewHistory',         # Boolean. If true, you can view any specific revision of the blog entry.
+        'tags',                     # String list.
+        'rating',                   # Integer.
+    )
 
 class Comment(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.id                     = None  # Integer.
-        self.creationTimeSeconds    = None 	# Integer. Time, when comment was created, in unix format.
-        self.commentatorHandle      = None 	# String.
-        self.locale                 = None 	# String.
-        self.text                   = None 	# String.
-        self.parentCommentId        = None  # Integer. Can be absent.
-        self.rating                 = None  # Integer.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'id',                       # Integer.
+        'creationTimeSeconds',      # Integer. Time, when comment was created, in unix format.
+        'commentatorHandle',        # String.
+        'locale',                   # String.
+        'text',                     # String.
+        'parentCommentId',          # Integer. Can be absent.
+        'rating',                   # Integer.
+    )
 
 class RecentAction(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.timeSeconds            = None 	# Integer. Action time, in unix format.
-        self.blogEntry              = None 	# BlogEntry object in short form. Can be absent.
-        self.comment                = None 	# Comment object. Can be absent.
-        self.dict_init(**kwargs)
-    
-    def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
-
-        if 'blogEntry' in kwargs:
-            setattr(self, 'blogEntry', BlogEntry(**kwargs))
+    __slots__ = (
+        'timeSeconds',              # Integer. Action time, in unix format.
+        '_blogEntry',               # BlogEntry object in short form. Can be absent.
+        '_comment',                 # Comment object. Can be absent.
+    )
+    blogEntry = _Nested('BlogEntry')
+    comment = _Nested('Comment')
 
 class RatingChange(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.contestId              = None 	# Integer.
-        self.contestName            = None 	# String. Localized.
-        self.handle                 = None	# String. Codeforces user handle.
-        self.rank                   = None	# Integer. Place of the user in the contest. This field contains user rank on the moment of rating update. If afterwards rank changes (e.g. someone get disqualified), this field will not be update and will contain old rank.
-        self.ratingUpdateTimeSeconds= None 	# Integer. Time, when rating for the contest was update, in unix-format.
-        self.oldRating              = None 	# Integer. User rating before the contest.
-        self.newRating              = None	# Integer. User rating after the contest.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'contestId',                # Integer.
+        'contestName',              # String. Localized.
+        'handle',                   # String. Codeforces user handle.
+        'rank',                     # Integer. Place of the user in the contest. This field contains user rank on the moment of rating update. If afterwards rank changes (e.g. someone get disqualified), this field will not be update and will contain old rank.
+        'ratingUpdateTimeSeconds',  # Integer. Time, when rating for the contest was update, in unix-format.
+        'oldRating',                # Integer. User rating before the contest.
+        'newRating',                # Integer. User rating after the contest.
+    )
 
 class Contest(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.id 	                = None  # Integer.
-        self.name 	                = None  # String. Localized.
-        self.type 	                = None  # Enum: CF, IOI, ICPC. Scoring system used for the contest.
-        self.phase 	                = None  # Enum: BEFORE, CODING, PENDING_SYSTEM_TEST, SYSTEM_TEST, FINISHED.
-        self.frozen 	            = None  # Boolean. If true, then the ranklist for the contest is frozen and shows only submissions, created before freeze.
-        self.durationSeconds 	    = None  # Integer. Duration of the contest in seconds.
-        self.startTimeSeconds       = None	# Integer. Can be absent. Contest start time in unix format.
-        self.relativeTimeSeconds    = None	# Integer. Can be absent. Number of seconds, passed after the start of the contest. Can be negative.
-        self.preparedBy 	        = None  # String. Can be absent. Handle of the user, how created the contest.
-        self.websiteUrl 	        = None  # String. Can be absent. URL for contest-related website.
-        self.description 	        = None  # String. Localized. Can be absent.
-        self.difficulty 	        = None  # Integer. Can be absent. From 1 to 5. Larger number means more difficult problems.
-        self.kind 	                = None  # String. Localized. Can be absent. Human-readable type of the contest from the following categories: Official ICPC Contest, Official School Contest, Opencup Contest, School/University/City/Region Championship, Training Camp Contest, Official International Personal Contest, Training Contest.
-        self.icpcRegion 	        = None  # String. Localized. Can be absent. Name of the Region for official ICPC contests.
-        self.country                = None	# String. Localized. Can be absent.
-        self.city                   = None	# String. Localized. Can be absent.
-        self.season 	            = None  # String. Can be absent.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'id',                       # Integer.
+        'name',                     # String. Localized.
+        'type',                     # Enum: CF, IOI, ICPC. Scoring system used for the contest.
+        'phase',                    # Enum: BEFORE, CODING, PENDING_SYSTEM_TEST, SYSTEM_TEST, FINISHED.
+        'frozen',                   # Boolean. If true, then the ranklist for the contest is frozen and shows only submissions, created before freeze.
+        'durationSeconds',          # Integer. Duration of the contest in seconds.
+        'startTimeSeconds',         # Integer. Can be absent. Contest start time in unix format.
+        'relativeTimeSeconds',      # Integer. Can be absent. Number of seconds, passed after the start of the contest. Can be negative.
+        'preparedBy',               # String. Can be absent. Handle of the user, how created the contest.
+        'websiteUrl',               # String. Can be absent. URL for contest-related website.
+        'description',              # String. Localized. Can be absent.
+        'difficulty',               # Integer. Can be absent. From 1 to 5. Larger number means more difficult problems.
+        'kind',                     # String. Localized. Can be absent. Human-readable type of the contest from the following categories: Official ICPC Contest, Official School Contest, Opencup Contest, School/University/City/Region Championship, Training Camp Contest, Official International Personal Contest, Training Contest.
+        'icpcRegion',               # String. Localized. Can be absent. Name of the Region for official ICPC contests.
+        'country',                  # String. Localized. Can be absent.
+        'city',                     # String. Localized. Can be absent.
+        'season',                   # String. Can be absent.
+    )
 
 class Party(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.contestId              = None	# Integer. Can be absent. Id of the contest, in which party is participating.
-        self.members 	            = None  # List of Member objects. Members of the party.
-        self.participantType 	    = None  # Enum: CONTESTANT, PRACTICE, VIRTUAL, MANAGER, OUT_OF_COMPETITION.
-        self.teamId 	            = None  # Integer. Can be absent. If party is a team, then it is a unique team id. Otherwise, this field is absent.
-        self.teamName               = None	# String. Localized. Can be absent. If party is a team or ghost, then it is a localized name of the team. Otherwise, it is absent.
-        self.ghost                  = None	# Boolean. If true then this party is a ghost. It participated in the contest, but not on Codeforces. For example, Andrew Stankevich Contests in Gym has ghosts of the participants from Petrozavodsk Training Camp.
-        self.room                   = None	# Integer. Can be absent. Room of the party. If absent, then the party has no room.
-        self.startTimeSeconds       = None	# Integer. Can be absent. Time, when this party started a contest.
-        self.dict_init(**kwargs)
-
-    def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
-
-        if 'members' in kwargs:
-            setattr(self, 'members', [Member(**x) for x in kwargs['members']])
+    __slots__ = (
+        'contestId',                # Integer. Can be absent. Id of the contest, in which party is participating.
+        '_members',                 # List of Member objects. Members of the party.
+        'participantType',          # Enum: CONTESTANT, PRACTICE, VIRTUAL, MANAGER, OUT_OF_COMPETITION.
+        'teamId',                   # Integer. Can be absent. If party is a team, then it is a unique team id. Otherwise, this field is absent.
+        'teamName',                 # String. Localized. Can be absent. If party is a team or ghost, then it is a localized name of the team. Otherwise, it is absent.
+        'ghost',                    # Boolean. If true then this party is a ghost. It participated in the contest, but not on Codeforces. For example, Andrew Stankevich Contests in Gym has ghosts of the participants from Petrozavodsk Training Camp.
+        'room',                     # Integer. Can be absent. Room of the party. If absent, then the party has no room.
+        'startTimeSeconds',         # Integer. Can be absent. Time, when this party started a contest.
+        'participantId',            # Integer. Can be absent. Identifier of the participant.
+    )
+    members = _Nested('Member', many=True)
 
 class Member(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.handle                 = None  # String. Codeforces user handle.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'handle',                   # String. Codeforces user handle.
+        'name',                     # String. Can be absent. User's name if available.
+    )
 
 class Problem(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.contestId              = None 	# Integer. Can be absent. Id of the contest, containing the problem.
-        self.problemsetName         = None	# String. Can be absent. Short name of the problemset the problem belongs to.
-        self.index                  = None	# String. Usually a letter of a letter, followed by a digit, that represent a problem index in a contest.
-        self.name                   = None	# String. Localized.
-        self.type                   = None	# Enum: PROGRAMMING, QUESTION.
-        self.points                 = None	# Floating point number. Can be absent. Maximum ammount of points for the problem.
-        self.rating                 = None	# Integer. Can be absent. Problem rating (difficulty).
-        self.tags                   = None	# String list. Problem tags.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'contestId',                # Integer. Can be absent. Id of the contest, containing the problem.
+        'problemsetName',           # String. Can be absent. Short name of the problemset the problem belongs to.
+        'index',                    # String. Usually a letter of a letter, followed by a digit, that represent a problem index in a contest.
+        'name',                     # String. Localized.
+        'type',                     # Enum: PROGRAMMING, QUESTION.
+        'points',                   # Floating point number. Can be absent. Maximum ammount of points for the problem.
+        'rating',                   # Integer. Can be absent. Problem rating (difficulty).
+        'tags',                     # String list. Problem tags.
+    )
 
 class ProblemStatistics(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.contestId 	            = None  # Integer. Can be absent. Id of the contest, containing the problem.
-        self.index              	= None  # String. Usually a letter of a letter, followed by a digit, that represent a problem index in a contest.
-        self.solvedCount 	        = None  # Integer. Number of users, who solved the problem.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'contestId',                # Integer. Can be absent. Id of the contest, containing the problem.
+        'index',                    # String. Usually a letter of a letter, followed by a digit, that represent a problem index in a contest.
+        'solvedCount',              # Integer. Number of users, who solved the problem.
+    )
 
 class Submission(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.id                     = None  # Integer.
-        self.contestId              = None  # Integer. Can be absent.
-        self.creationTimeSeconds    = None  # Integer. Time, when submission was created, in unix-format.
-        self.relativeTimeSeconds    = None  # Integer. Number of seconds, passed after the start of the contest (or a virtual start for virtual parties), before the submission.
-        self.problem                = None  # Problem object.
-        self.author                 = None  # Party object.
-        self.programmingLanguage    = None  # String.
-        self.verdict                = None  # Enum: FAILED, OK, PARTIAL, COMPILATION_ERROR, RUNTIME_ERROR, WRONG_ANSWER, PRESENTATION_ERROR, TIME_LIMIT_EXCEEDED, MEMORY_LIMIT_EXCEEDED, IDLENESS_LIMIT_EXCEEDED, SECURITY_VIOLATED, CRASHED, INPUT_PREPARATION_CRASHED, CHALLENGED, SKIPPED, TESTING, REJECTED. Can be absent.
-        self.testset                = None  # Enum: SAMPLES, PRETESTS, TESTS, CHALLENGES, TESTS1, ..., TESTS10. Testset used for judging the submission.
-        self.passedTestCount        = None  # Integer. Number of passed tests.
-        self.timeConsumedMillis     = None  # Integer. Maximum time in milliseconds, consumed by solution for one test.
-        self.memoryConsumedBytes    = None  # Integer. Maximum memory in bytes, consumed by solution for one test.
-        self.dict_init(**kwargs)
+    __slots__ = (
+        'id',                       # Integer.
+        'contestId',                # Integer. Can be absent.
+        'creationTimeSeconds',      # Integer. Time, when submission was created, in unix-format.
+        'relativeTimeSeconds',      # Integer. Number of seconds, passed after the start of the contest (or a virtual start for virtual parties), before the submission.
+        '_problem',                 # Problem object.
+        '_author',                  # Party object.
+        'programmingLanguage',      # String.
+        'verdict',                  # Enum: FAILED, OK, PARTIAL, COMPILATION_ERROR, RUNTIME_ERROR, WRONG_ANSWER, PRESENTATION_ERROR, TIME_LIMIT_EXCEEDED, MEMORY_LIMIT_EXCEEDED, IDLENESS_LIMIT_EXCEEDED, SECURITY_VIOLATED, CRASHED, INPUT_PREPARATION_CRASHED, CHALLENGED, SKIPPED, TESTING, REJECTED. Can be absent.
+        'testset',                  # Enum: SAMPLES, PRETESTS, TESTS, CHALLENGES, TESTS1, ..., TESTS10. Testset used for judging the submission.
+        'passedTestCount',          # Integer. Number of passed tests.
+        'timeConsumedMillis',       # Integer. Maximum time in milliseconds, consumed by solution for one test.
+        'memoryConsumedBytes',      # Integer. Maximum memory in bytes, consumed by solution for one test.
+        'points',                   # Floating point number. Can be absent. Number of scored points for IOI-like contests.
+    )
+    problem = _Nested('Problem')
+    author = _Nested('Party')
 
-    def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
+class Hack(CodeforcesObject):
+    __slots__ = (
+        'id',                       # Integer.
+        'creationTimeSeconds',      # Integer. Hack creation time in unix format.
+        '_hacker',                  # Party object.
+        '_defender',                # Party object.
+        'verdict',                  # Enum: HACK_SUCCESSFUL, HACK_UNSUCCESSFUL, INVALID_INPUT, GENERATOR_INCOMPILABLE, GENERATOR_CRASHED, IGNORED, TESTING, OTHER. Can be absent.
+        '_problem',                 # Problem object. Hacked problem.
+        'test',                     # String. Can be absent.
+        'judgeProtocol',            # Object with three fields: "manual", "protocol" and "verdict". Field manual can have values "true" and "false". If manual is "true" then test for the hack was entered manually. Fields "protocol" and "verdict" contain human-readable description of judge protocol and hack verdict. Localized. Can be absent.
+    )
+    hacker = _Nested('Party')
+    defender = _Nested('Party')
+    problem = _Nested('Problem')
 
-        if 'problem' in kwargs:
-            setattr(self, 'problem', Problem(**kwargs['problem']))
-        
-        if 'author' in kwargs:
-            setattr(self, 'author', Party(**kwargs['author']))
+class RanklistRow(CodeforcesObject):
+    __slots__ = (
+        '_party',                   # Party object. Party that took a corresponding place in the contest.
+        'rank',                     # Integer. Party place in the contest.
+        'points',                   # Floating point number. Total ammount of points, scored by the party.
+        'penalty',                  # Integer. Total penalty (in ICPC meaning) of the party.
+        'successfulHackCount',      # Integer.
+        'unsuccessfulHackCount',    # Integer.
+        '_problemResults',          # List of ProblemResult objects. Party results for each problem. Order of the problems is the same as in "problems" field of the returned object.
+        'lastSubmissionTimeSeconds',# Integer. For IOI contests only. Time in seconds from the start of the contest to the last submission that added some points to the total score of the party.
+    )
+    party = _Nested('Party')
+    problemResults = _Nested('ProblemResult', many=True)
 
-class Hack(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.id                     = None 	# Integer.
-        self.creationTimeSeconds    = None	# Integer. Hack creation time in unix format.
-        self.hacker                 = None	# Party object.
-        self.defender               = None	# Party object.
-        self.verdict                = None	# Enum: HACK_SUCCESSFUL, HACK_UNSUCCESSFUL, INVALID_INPUT, GENERATOR_INCOMPILABLE, GENERATOR_CRASHED, IGNORED, TESTING, OTHER. Can be absent.
-        self.problem                = None	# Problem object. Hacked problem.
-        self.test                   = None	# String. Can be absent.
-        self.judgeProtocol          = None	# Object with three fields: "manual", "protocol" and "verdict". Field manual can have values "true" and "false". If manual is "true" then test for the hack was entered manually. Fields "protocol" and "verdict" contain human-readable description of judge protocol and hack verdict. Localized. Can be absent.
-        self.dict_init(**kwargs)
-    
-    def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
+class ProblemResult(CodeforcesObject):
+    __slots__ = (
+        'points',                   # Floating point number.
+        'penalty',                  # Integer. Penalty (in ICPC meaning) of the party for this problem.
+        'rejectedAttemptCount',     # Integer. Number of incorrect submissions.
+        'type',                     # Enum: PRELIMINARY, FINAL. If type is PRELIMINARY then points can decrease (if, for example, solution will fail during system test). Otherwise, party can only increase points for this problem by submitting better solutions.
+        'bestSubmissionTimeSeconds',# Integer. Number of seconds after the start of the contest before the submission, that brought maximal amount of points for this problem.
+    )
 
-        if 'hacker' in kwargs:
-            setattr(self, 'hacker', Party(**kwargs['hacker']))
-        
-        if 'defender' in kwargs:
-            setattr(self, 'defender', Party(**kwargs['defender']))
-        
-        if 'problem' in kwargs:
-            setattr(self, 'problem', Problem(**kwargs['problem']))
+"""
+Columnar results for analytics (require numpy)
+"""
 
-class RanklistRow(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.party                  = None	# Party object. Party that took a corresponding place in the contest.
-        self.rank                   = None	# Integer. Party place in the contest.
-        self.points                 = None	# Floating point number. Total ammount of points, scored by the party.
-        self.penalty                = None	# Integer. Total penalty (in ICPC meaning) of the party.
-        self.successfulHackCount    = None	# Integer.
-        self.unsuccessfulHackCount  = None	# Integer.
-        self.problemResults         = None	# List of ProblemResult objects. Party results for each problem. Order of the problems is the same as in "problems" field of the returned object.
-        self.lastSubmissionTimeSeconds=None	# Integer. For IOI contests only. Time in seconds from the start of the contest to the last submission that added some points to the total score of the party.
-        self.dict_init(**kwargs)
-    
-    def dict_init(self, **kwargs):
-        self.__dict__.update(**kwargs)
+class _ColumnTable:
+    """
+    Rows stored as one NumPy array per field. Numeric columns hold int64
+    values, -1 where the field was absent. Categorical columns hold int32
+    codes into categories[column].
 
-        if 'party' in kwargs:
-            setattr(self, 'party', Party(**kwargs['party']))
-        
-        if 'problemResults' in kwargs:
-            setattr(self, 'problemResults', [ProblemResult(**x) for x in kwargs['problemResults']])
+    Parameter:
+    -   columns: 	Dict from column name to its array.
+    -   categories: 	Dict from categorical column name to the list of its values.
+    """
 
-class ProblemResult(CodeforcesObject):
-    def __init__(self, **kwargs):
-        self.points                 = None	# Floating point number.
-        self.penalty                = None	# Integer. Penalty (in ICPC meaning) of the party for this problem.
-        self.rejectedAttemptCount   = None 	# Integer. Number of incorrect submissions.
-        self.type                   = None	# Enum: PRELIMINARY, FINAL. If type is PRELIMINARY then points can decrease (if, for example, solution will fail during system test). Otherwise, party can only increase points for this problem by submitting better solutions.
-        self.bestSubmissionTimeSeconds=None # Integer. Number of seconds after the start of the contest before the submission, that brought maximal amount of points for this problem.
-        self.dict_init(**kwargs)
\ No newline at end of file
+    NUMERIC = ()
+    CATEGORICAL = ()
+
+    def __init__(self, columns, categories):
+        if np is None:
+            raise ImportError(f'{type(self).__name__} requires numpy')
+
+        self.columns = columns
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.columns[self.NUMERIC[0]])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def values(self, column):
+        """
+        Returns a categorical column decoded to its values.
+        """
+
+        return np.array(self.categories[column], dtype=object)[self.columns[column]]
+
+    def code(self, column, value):
+        """
+        Returns the code of value in a categorical column, or -1 if it never occurs.
+        """
+
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def filter(self, mask = None, **equals):
+        """
+        Returns the rows where mask is true and every categorical column
+        given as a keyword equals its value, e.g.
+        filter(table['timeConsumedMillis'] > 1000, verdict='OK').
+        """
+
+        if mask is None:
+            mask = np.ones(len(self), dtype=bool)
+        for column in equals:
+            mask = mask & (self.columns[column] == self.code(column, equals[column]))
+
+        return self._subset(mask)
+
+    def group_count(self, column):
+        """
+        Returns a dict from each value of a categorical column to its number of rows.
+        """
+
+        counts = np.bincount(self.columns[column], minlength=len(self.categories[column]))
+        return {value: int(count) for value, count in zip(self.categories[column], counts) if count}
+
+    def group_by(self, key, column, agg = 'mean'):
+        """
+        Aggregates a numeric column per value of the categorical column key.
+        Return value: A dict from each value of key to the sum, mean, min
+        or max of column.
+        """
+
+        codes = self.columns[key]
+        size = len(self.categories[key])
+        values = self.columns[column]
+        counts = np.bincount(codes, minlength=size)
+
+        if agg in ('sum', 'mean'):
+            result = np.bincount(codes, weights=values, minlength=size)
+            if agg == 'mean':
+                result = result / np.maximum(counts, 1)
+        elif agg in ('min', 'max'):
+            ufunc = np.minimum if agg == 'min' else np.maximum
+            info = np.iinfo if values.dtype.kind == 'i' else np.finfo
+            start = info(values.dtype).max if agg == 'min' else info(values.dtype).min
+            result = np.full(size, start, dtype=values.dtype)
+            ufunc.at(result, codes, values)
+        else:
+            raise ValueError(f'Unknown aggregation {agg!r}')
+
+        return {value: result[i].item() for i, value in enumerate(self.categories[key]) if counts[i]}
+
+    def crosstab(self, rows, columns):
+        """
+        Counts rows for every pair of values of two categorical columns,
+        e.g. crosstab('programmingLanguage', 'verdict').
+        Return value: The count matrix, the values of rows and the values of columns.
+        """
+
+        width = len(self.categories[columns])
+        height = len(self.categories[rows])
+        pairs = self.columns[rows].astype(np.int64) * width + self.columns[columns]
+        counts = np.bincount(pairs, minlength=width * height).reshape(height, width)
+        return counts, self.categories[rows], self.categories[columns]
+
+    def histogram(self, column, bins = 10, range = None):
+        """
+        Histogram of a numeric column, see numpy.histogram.
+        """
+
+        return np.histogram(self.columns[column], bins=bins, range=range)
+
+    def _subset(self, mask):
+        return type(self)({x: self.columns[x][mask] for x in self.columns}, self.categories)
+
+class SubmissionTable(_ColumnTable):
+    """
+    A list of submissions stored column by column instead of one
+    Submission object per row, for vectorized statistics:
+
+        ok, table = client.contest_status_table(566)
+        table.filter(verdict='OK').group_count('programmingLanguage')
+    """
+
+    NUMERIC = ('id', 'contestId', 'creationTimeSeconds', 'timeConsumedMillis', 'memoryConsumedBytes')
+    CATEGORICAL = ('verdict', 'problem', 'programmingLanguage', 'author')
+
+    @classmethod
+    def from_json(cls, result):
+        """
+        Builds the table from the "result" field of contest.status,
+        user.status or problemset.recentStatus.
+        """
+
+        numeric = {x: [] for x in cls.NUMERIC}
+        codes = {x: [] for x in cls.CATEGORICAL}
+        lookup = {x: {} for x in cls.CATEGORICAL}
+
+        for submission in result:
+            for x in cls.NUMERIC:
+                numeric[x].append(submission.get(x, -1))
+
+            values = (
+                submission.get('verdict'),
+                submission['problem'].get('index'),
+                submission.get('programmingLanguage'),
+                _party_name(submission['author']),
+            )
+            for x, value in zip(cls.CATEGORICAL, values):
+                codes[x].append(lookup[x].setdefault(value, len(lookup[x])))
+
+        columns = {x: np.array(numeric[x], dtype=np.int64) for x in cls.NUMERIC}
+        columns.update({x: np.array(codes[x], dtype=np.int32) for x in cls.CATEGORICAL})
+        return cls(columns, {x: list(lookup[x]) for x in cls.CATEGORICAL})
+
+class StandingsTable(_ColumnTable):
+    """
+    The rows of contest.standings stored column by column. Per-problem
+    results are (rows x problems) matrices: problemPoints,
+    rejectedAttemptCount and bestSubmissionTimeSeconds. The party column
+    names a row by its team name or ';'-joined handles, and the members,
+    teamName, teamId and ghost columns keep the rest of the party. The
+    contest and problems are kept as the raw dicts of the response.
+
+        ok, table = client.contest_standings_table(566)
+        table.rank_of('tourist')
+    """
+
+    NUMERIC = ('rank', 'penalty', 'successfulHackCount', 'unsuccessfulHackCount', 'lastSubmissionTimeSeconds')
+    CATEGORICAL = ('party', 'participantType', 'members', 'teamName')
+
+    def __init__(self, columns, categories, contest = None, problems = None):
+        super().__init__(columns, categories)
+        self.contest = contest
+        self.problems = problems or []
+
+    @classmethod
+    def from_json(cls, result):
+        """
+        Builds the table from the "result" field of contest.standings.
+        """
+
+        numeric = {x: [] for x in cls.NUMERIC}
+        points = []
+        teamIds = []
+        ghosts = []
+        matrices = {'problemPoints': [], 'rejectedAttemptCount': [], 'bestSubmissionTimeSeconds': []}
+        codes = {x: [] for x in cls.CATEGORICAL}
+        lookup = {x: {} for x in cls.CATEGORICAL}
+
+        for row in result['rows']:
+            for x in cls.NUMERIC:
+                numeric[x].append(row.get(x, -1))
+            points.append(row['points'])
+
+            results = row['problemResults']
+            matrices['problemPoints'].append([x['points'] for x in results])
+            matrices['rejectedAttemptCount'].append([x['rejectedAttemptCount'] for x in results])
+            matrices['bestSubmissionTimeSeconds'].append([x.get('bestSubmissionTimeSeconds', -1) for x in results])
+
+            party = row['party']
+            teamIds.append(party.get('teamId', -1))
+            ghosts.append(party.get('ghost', False))
+            values = (_party_name(party), party.get('participantType'),
+                      ';'.join(x['handle'] for x in party['members']), party.get('teamName'))
+            for x, value in zip(cls.CATEGORICAL, values):
+                codes[x].append(lookup[x].setdefault(value, len(lookup[x])))
+
+        shape = len(result['rows']), len(result['problems'])
+        columns = {x: np.array(numeric[x], dtype=np.int64) for x in cls.NUMERIC}
+        columns['points'] = np.array(points, dtype=np.float64)
+        columns['teamId'] = np.array(teamIds, dtype=np.int64)
+        columns['ghost'] = np.array(ghosts, dtype=bool)
+        columns['problemPoints'] = np.array(matrices['problemPoints'], dtype=np.float64).reshape(shape)
+        columns['rejectedAttemptCount'] = np.array(matrices['rejectedAttemptCount'], dtype=np.int32).reshape(shape)
+        columns['bestSubmissionTimeSeconds'] = np.array(matrices['bestSubmissionTimeSeconds'], dtype=np.int64).reshape(shape)
+        columns.update({x: np.array(codes[x], dtype=np.int32) for x in cls.CATEGORICAL})
+        return cls(columns, {x: list(lookup[x]) for x in cls.CATEGORICAL}, result['contest'], result['problems'])
+
+    def find(self, party):
+        """
+        Returns the row indices of a party, given as a handle, a team name
+        or ';'-joined member handles.
+        """
+
+        return np.flatnonzero(self.columns['party'] == self.code('party', party))
+
+    def rank_of(self, party):
+        """
+        Returns the best rank of a party, or None if it is not in the table.
+        """
+
+        rows = self.find(party)
+        if not len(rows):
+            return None
+        return int(self.columns['rank'][rows].min())
+
+    def row(self, i):
+        """
+        Builds the RanklistRow object of the i-th row.
+        """
+
+        participantType = self.categories['participantType'][self.columns['participantType'][i]]
+        if 'members' in self.columns:
+            handles = self.categories['members'][self.columns['members'][i]]
+            teamId = self.columns['teamId'][i].item()
+            party = Party(members=[Member(handle=x) for x in handles.split(';') if x], participantType=participantType,
+                          teamId=teamId if teamId != -1 else None, ghost=self.columns['ghost'][i].item(),
+                          teamName=self.categories['teamName'][self.columns['teamName'][i]])
+        else:
+            # Snapshots written before the party columns
+            name = self.categories['party'][self.columns['party'][i]]
+            party = Party(members=[Member(handle=x) for x in name.split(';')], participantType=participantType)
+        fields = {x: self.columns[x][i].item() for x in self.NUMERIC if self.columns[x][i] != -1}
+        results = [
+            ProblemResult(points=points.item(), rejectedAttemptCount=rejected.item(),
+                          bestSubmissionTimeSeconds=best.item() if best != -1 else None)
+            for points, rejected, best in zip(self.columns['problemPoints'][i],
+                                              self.columns['rejectedAttemptCount'][i],
+                                              self.columns['bestSubmissionTimeSeconds'][i])
+        ]
+        return RanklistRow(
+            party=party,
+            points=self.columns['points'][i].item(),
+            problemResults=results,
+            **fields
+        )
+
+    def _subset(self, mask):
+        columns = {x: self.columns[x][mask] for x in self.columns}
+        return StandingsTable(columns, self.categories, self.contest, self.problems)
+
+def _party_name(party):
+    return party.get('teamName') or ';'.join(x['handle'] for x in party['members'])
+
+class Snapshot:
+    """
+    Archive of a contest's standings and submissions in a single file.
+    Every column is stored (and compressed) separately, and the file is
+    memory-mapped when opened, so only the columns a query touches are
+    ever read or decompressed:
+
+        Snapshot.write('566.cfsnap', standings=table, submissions=status)
+        snapshot = Snapshot.open('566.cfsnap')
+        snapshot.standings.rank_of('tourist')
+
+    Uncompressed columns are used in place from the mapping without a copy.
+    """
+
+    MAGIC = b'CFSNAP1\n'
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f'{path} is not a snapshot')
+        start = len(self.MAGIC) + 8
+        size = int.from_bytes(self._map[len(self.MAGIC):start], 'little')
+        header = json.loads(bytes(self._map[start:start + size]))
+
+        tables = {'standings': StandingsTable, 'submissions': SubmissionTable}
+        self.meta = header['meta']
+        self.standings = None
+        self.submissions = None
+        for name in header['tables']:
+            columns = _SnapshotColumns(self._map, header['tables'][name]['columns'])
+            categories = _SnapshotColumns(self._map, header['tables'][name]['categories'])
+            table = tables[name](columns, categories)
+            if name == 'standings':
+                table.contest = self.meta.get('contest')
+                table.problems = self.meta.get('problems', [])
+            setattr(self, name, table)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Opens a snapshot written by write().
+        """
+
+        return cls(path)
+
+    @classmethod
+    def write(cls, path, standings = None, submissions = None, compress = True):
+        """
+        Writes a snapshot.
+
+        Parameter:
+        -   standings: 	StandingsTable to store.
+        -   submissions: 	SubmissionTable to store.
+        -   compress: 	If true, columns are zlib-compressed. Otherwise they take
+                        more space but are read without a copy.
+        """
+
+        blobs = []
+        offset = 0
+        def add(data, codec, **info):
+            nonlocal offset
+            if codec == 'zlib':
+                data = zlib.compress(data)
+            padding = -len(data) % 8        # Keeps arrays aligned in the mapping
+            blobs.append(data + b'\0' * padding)
+            entry = dict(info, codec=codec, offset=offset, size=len(data))
+            offset += len(data) + padding
+            return entry
+
+        codec = 'zlib' if compress else 'raw'
+        header = {'meta': {}, 'tables': {}}
+        for name, table in (('standings', standings), ('submissions', submissions)):
+            if table is None:
+                continue
+            columns = {}
+            for x in table.columns:
+                array = np.ascontiguousarray(table.columns[x])
+                columns[x] = add(array.tobytes(), codec, dtype=array.dtype.str, shape=array.shape)
+            categories = {x: add(json.dumps(table.categories[x]).encode(), 'zlib') for x in table.categories}
+            header['tables'][name] = {'columns': columns, 'categories': categories}
+        if standings is not None:
+            header['meta'] = {'contest': standings.contest, 'problems': standings.problems}
+
+        header = json.dumps(header).encode()
+        header += b' ' * (-(len(cls.MAGIC) + 8 + len(header)) % 8)
+        with open(path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+
+    def close(self):
+        """
+        Unmaps the file. Arrays still in use keep it mapped until they are freed.
+        """
+
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+class _SnapshotColumns(collections.abc.Mapping):
+    """
+    Columns of a snapshot, read from the mapping on first access.
+    """
+
+    def __init__(self, mapping, entries):
+        self._map = mapping
+        self._entries = entries
+        self._loaded = {}
+        self._base = len(Snapshot.MAGIC) + 8 + int.from_bytes(mapping[len(Snapshot.MAGIC):len(Snapshot.MAGIC) + 8], 'little')
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            self._loaded[name] = self._load(self._entries[name])
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, entry):
+        start = self._base + entry['offset']
+        data = memoryview(self._map)[start:start + entry['size']]
+        if entry['codec'] == 'zlib':
+            data = zlib.decompress(data)
+        if 'dtype' not in entry:
+            return json.loads(bytes(data))
+        return np.frombuffer(data, dtype=entry['dtype']).reshape(entry['shape'])
+
+"""
+Client shared by every API function
+"""
+
+API_URL = 'https://codeforces.com/api/'
+
+# Decodes response bodies, orjson is several times faster when installed
+json_decoder = orjson.loads if orjson is not None else json.loads
+
+# What call() and the API methods return: Codeforces objects, the decoded
+# "result" field as dicts and lists, or its undecoded bytes
+OUTPUTS = ('objects', 'dicts', 'raw')
+
+class RateLimiter:
+    """
+    Token bucket which spaces calls out so that Codeforces never rejects
+    them with "Call limit exceeded". Callers from any thread queue up in
+    acquire() and are let through in order of priority, then arrival.
+
+    Parameter:
+    -   rate: 	Tokens added per second. Codeforces allows one call every two seconds.
+    -   burst: 	Maximum number of tokens that can be saved up while idle.
+    """
+
+    def __init__(self, rate = 0.5, burst = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters = []                  # Heap of (priority, arrival, event).
+        self._arrivals = itertools.count()
+        self._acquired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def acquire(self, priority = 0):
+        """
+        Blocks until the caller may send one request. Smaller priorities
+        are served first.
+        """
+
+        start = time.monotonic()
+        event = threading.Event()
+        self._enqueue(priority, event)
+        try:
+            while True:
+                with self._lock:
+                    event.clear()
+                    delay = self._take(event)
+                if delay == 0:
+                    break
+                event.wait(delay)
+        except BaseException:
+            self._dequeue(event)
+            raise
+
+        self._record(time.monotonic() - start)
+
+    async def acquire_async(self, priority = 0):
+        """
+        Like acquire(), but waits without blocking the event loop. Sync
+        and asyncio callers share the same queue.
+        """
+
+        start = time.monotonic()
+        event = _LoopEvent()
+        self._enqueue(priority, event)
+        try:
+            while True:
+                with self._lock:
+                    event.clear()
+                    delay = self._take(event)
+                if delay == 0:
+                    break
+                await event.wait(delay)
+        except BaseException:
+            self._dequeue(event)
+            raise
+
+        self._record(time.monotonic() - start)
+
+    def penalize(self):
+        """
+        Throws away the saved tokens, e.g. after Codeforces answered
+        "Call limit exceeded" because someone else used the same quota.
+        """
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0)
+
+    def stats(self):
+        """
+        Returns the queue depth and how long callers had to wait, in seconds.
+        """
+
+        with self._lock:
+            return {
+                'queued': len(self._waiters),
+                'acquired': self._acquired,
+                'total_wait': self._total_wait,
+                'mean_wait': self._total_wait / self._acquired if self._acquired else 0.0,
+                'max_wait': self._max_wait,
+            }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enqueue(self, priority, waiter):
+        with self._lock:
+            heapq.heappush(self._waiters, (priority, next(self._arrivals), waiter))
+
+    def _dequeue(self, waiter):
+        # Removes a caller that gave up waiting, e.g. a cancelled task
+        with self._lock:
+            self._waiters = [x for x in self._waiters if x[2] is not waiter]
+            heapq.heapify(self._waiters)
+            if self._waiters:
+                self._waiters[0][2].set()
+
+    def _take(self, waiter):
+        # Must hold the lock. Returns 0 if waiter got a token, otherwise how
+        # long to sleep before trying again (None = until woken up).
+        if self._waiters[0][2] is not waiter:
+            return None
+
+        delay = self._take_token()
+        if delay:
+            return delay
+
+        heapq.heappop(self._waiters)
+        if self._waiters:
+            self._waiters[0][2].set()
+        return 0
+
+    def _take_token(self):
+        # Takes a token from the bucket, or returns how long until there is one
+        self._refill()
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        return 0
+
+    def _record(self, waited):
+        with self._lock:
+            self._acquired += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+class _LoopEvent:
+    """
+    threading.Event look-alike for coroutines, which may be set from any thread.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def set(self):
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    def clear(self):
+        self._event.clear()
+
+    async def wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+class SharedRateLimiter(RateLimiter):
+    """
+    RateLimiter whose bucket is kept in a SQLite file, so that every process
+    of the host using the same path shares one quota, e.g. the workers of a
+    server. Within a process callers still queue by priority, and the first
+    in line takes its token from the shared bucket.
+
+        limiter = SharedRateLimiter('/tmp/codeforces.db')
+        client = CodeforcesClient(rate_limiter=limiter, cache=ResponseCache(path='/tmp/codeforces.db'))
+
+    Parameter:
+    -   path (Required): 	SQLite file holding the bucket. It can be the file of a ResponseCache.
+    -   rate, burst: 	Same as for RateLimiter. Every process should use the same values.
+    """
+
+    def __init__(self, path, rate = 0.5, burst = 1):
+        super().__init__(rate, burst)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS bucket (id INTEGER PRIMARY KEY CHECK (id = 0), tokens REAL, updated REAL)')
+        self._db.execute('INSERT OR IGNORE INTO bucket VALUES (0, ?, ?)', (burst, time.time()))
+
+    def penalize(self):
+        with self._lock:
+            self._update(lambda tokens: (min(tokens, 0), None))
+
+    def _take_token(self):
+        return self._update(lambda tokens: (tokens, (1 - tokens) / self.rate) if tokens < 1 else (tokens - 1, 0))
+
+    def _update(self, change):
+        # Refills the shared bucket and applies change(tokens) -> (tokens,
+        # return value) to it in one transaction. The wall clock is used as
+        # it is the same for every process.
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            tokens, updated = self._db.execute('SELECT tokens, updated FROM bucket').fetchone()
+            now = time.time()
+            tokens, result = change(min(self.burst, tokens + max(0, now - updated) * self.rate))
+            self._db.execute('UPDATE bucket SET tokens = ?, updated = ?', (tokens, now))
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+        return result
+
+# Quota shared by every client of this process
+default_rate_limiter = RateLimiter()
+
+class CircuitBreaker:
+    """
+    Stops sending calls for a while once Codeforces keeps failing, so that
+    callers fail (or get a stale result) at once instead of piling up on
+    retries while it is down. After reset_timeout seconds one trial call is
+    let through; if it works the circuit closes again, otherwise it stays
+    open for another reset_timeout. A trial call which never reports back
+    (it raised or was cancelled) is given up on after reset_timeout too.
+
+    Parameter:
+    -   failures: 	Number of consecutive failed calls (after their retries) which open the circuit.
+    -   reset_timeout: 	Seconds to wait before the trial call.
+    """
+
+    def __init__(self, failures = 5, reset_timeout = 30):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'       # closed, open or half-open (the trial call is in flight)
+        self._count = 0
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns True if a call may be sent now.
+        """
+
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state != 'closed' and time.monotonic() - self._opened >= self.reset_timeout:
+                # Open long enough, or the last trial call never came back
+                self.state = 'half-open'
+                self._opened = time.monotonic()
+                return True
+            return False
+
+    def record(self, success):
+        """
+        Records whether a call which was allowed got an answer from Codeforces.
+        """
+
+        with self._lock:
+            if success:
+                self._count = 0
+                self.state = 'closed'
+                return
+            self._count += 1
+            if self.state == 'half-open' or self._count >= self.failures:
+                self.state = 'open'
+                self._opened = time.monotonic()
+
+default_circuit_breaker = CircuitBreaker()
+
+def _ratingChanges_ttl(params, result):
+    # Rating changes are only published once a contest is finished
+    return None if result else 0
+
+# Default seconds to keep each method's result. None means forever,
+# missing methods (like recentActions) are never cached.
+CACHE_TTL = {
+    'contest.list':             300,
+    'contest.ratingChanges':    _ratingChanges_ttl,
+    'problemset.problems':      3600,
+    'user.ratedList':           3600,
+}
+
+class ResponseCache:
+    """
+    Keeps the "result" field of recent responses, so repeated calls are
+    answered locally. Entries live in a bounded in-memory LRU and,
+    if path is given, in a SQLite file that survives restarts.
+
+    Parameter:
+    -   maxsize: 	Maximum number of responses kept in memory.
+    -   ttl: 	Dict from method name to seconds, overriding CACHE_TTL. A value
+                can also be a function (params, result) -> seconds.
+    -   path: 	SQLite file for the on-disk tier. None keeps everything in memory.
+                The file can be shared by the processes of a host: they see each
+                other's responses, and while one process fetches a call the others
+                wait for its result instead of fetching it too (see claim()).
+    -   lease: 	Seconds after which a claimed call which wasn't answered may be fetched by another process.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(self, maxsize = 256, ttl = None, path = None, lease = 60):
+        self.maxsize = maxsize
+        self.lease = lease
+        self.ttl = dict(CACHE_TTL, **(ttl or {}))
+        self._memory = collections.OrderedDict()    # key -> (expires, result)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._disk = None
+        if path is not None:
+            self._disk = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._disk.execute('PRAGMA journal_mode=WAL')
+            self._disk.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, result TEXT)')
+            self._disk.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires REAL)')
+
+    def get(self, method, params):
+        """
+        Returns (True, result) if a fresh response is cached, otherwise (False, None).
+        """
+
+        if self.ttl.get(method, 0) == 0:
+            return False, None
+
+        key = _cache_key(method, params)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return True, entry[1]
+
+            if self._disk is not None:
+                row = self._disk.execute('SELECT expires, result FROM responses WHERE key = ?', (key,)).fetchone()
+                if row is not None and (row[0] is None or row[0] > now):
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, entry)
+                    self._disk_hits += 1
+                    return True, entry[1]
+
+            self._misses += 1
+            return False, None
+
+    def put(self, method, params, result):
+        """
+        Stores a result according to the TTL policy of its method.
+        """
+
+        ttl = self.ttl.get(method, 0)
+        if callable(ttl):
+            ttl = ttl(params, result)
+        if ttl == 0:
+            return
+
+        key = _cache_key(method, params)
+        expires = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._remember(key, (expires, result))
+            if self._disk is not None:
+                self._disk.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', (key, expires, json.dumps(result)))
+
+    def claim(self, method, params):
+        """
+        Called after a miss. Returns True if the caller should fetch the call
+        itself, False if another process sharing the file is fetching it
+        (then get() it again a bit later). A claim lasts until release().
+        """
+
+        if self._disk is None or self.ttl.get(method, 0) == 0:
+            return True
+
+        key = _cache_key(method, params)
+        now = time.time()
+        with self._lock:
+            self._disk.execute('DELETE FROM leases WHERE key = ? AND expires < ?', (key, now))
+            return self._disk.execute('INSERT OR IGNORE INTO leases VALUES (?, ?)', (key, now + self.lease)).rowcount == 1
+
+    def release(self, method, params):
+        """
+        Ends the claim of a call, whether it was answered or not.
+        """
+
+        if self._disk is None or self.ttl.get(method, 0) == 0:
+            return
+
+        with self._lock:
+            self._disk.execute('DELETE FROM leases WHERE key = ?', (_cache_key(method, params),))
+
+    def invalidate(self, method = None, **params):
+        """
+        Drops cached responses: everything if method is None, every call
+        of method if no parameters are given, otherwise one call.
+        """
+
+        with self._lock:
+            if method is None:
+                keys = list(self._memory)
+                query = 'DELETE FROM responses', ()
+            elif not params:
+                keys = [x for x in self._memory if x.startswith(method + '?')]
+                query = 'DELETE FROM responses WHERE substr(key, 1, ?) = ?', (len(method) + 1, method + '?')
+            else:
+                keys = [_cache_key(method, _params(params))]
+                query = 'DELETE FROM responses WHERE key = ?', (keys[0],)
+
+            for key in keys:
+                self._memory.pop(key, None)
+            if self._disk is not None:
+                self._disk.execute(*query)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters and the number of responses in memory.
+        """
+
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'size': len(self._memory),
+            }
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+def _cache_key(method, params):
+    return method + '?' + '&'.join(f'{x}={params[x]}' for x in sorted(params))
+
+class Interner:
+    """
+    Identity map for objects which repeat across results. Within and
+    across calls, every problem with the same (contestId, index) is one
+    Problem object, and every party with the same contest, members and
+    participantType is one Party object, with interned handle strings.
+    Pass it to a client with interner= to use it for every call.
+
+    After each call a report with the number of objects built, the number
+    of duplicates shared instead and an estimate of the bytes saved is
+    appended to reports.
+
+    Parameter:
+    -   maxsize: 	Number of problems and parties remembered. The maps are
+                    cleared when they grow past it.
+    """
+
+    def __init__(self, maxsize = 1000000):
+        self.maxsize = maxsize
+        self.reports = collections.deque(maxlen=1000)
+        self._problems = {}
+        self._parties = {}
+        self._lock = threading.Lock()
+        self._shared = 0
+        self._saved = 0
+
+    def build(self, method, result):
+        """
+        Converts the "result" field of method to Codeforces objects, like
+        the client does, but shares the repeated ones.
+        """
+
+        with self._lock:
+            if len(self._problems) + len(self._parties) > self.maxsize:
+                self.clear()
+            self._shared = 0
+            self._saved = 0
+
+            if method in ('contest.status', 'user.status', 'problemset.recentStatus'):
+                objects = [self._submission(x) for x in result]
+            elif method == 'contest.hacks':
+                objects = [self._hack(x) for x in result]
+            elif method == 'contest.standings':
+                objects = (
+                    Contest(**result['contest']),
+                    [self.problem(x) for x in result['problems']],
+                    [self._row(x) for x in result['rows']]
+                )
+            elif method == 'problemset.problems':
+                objects = (
+                    [self.problem(x) for x in result['problems']],
+                    [ProblemStatistics(**x) for x in result['problemStatistics']]
+                )
+            else:
+                objects = _BUILDERS[method](result)
+
+            self.reports.append({
+                'method': method,
+                'objects': len(objects[-1]) if isinstance(objects, tuple) else len(objects),
+                'shared': self._shared,
+                'bytes_saved': self._saved,
+            })
+            return objects
+
+    def problem(self, raw):
+        """
+        Returns the Problem object for a raw problem dict.
+        """
+
+        key = (raw.get('contestId'), raw.get('problemsetName'), raw.get('index'))
+        problem = self._problems.get(key)
+        if problem is None:
+            problem = self._problems[key] = Problem(**raw)
+        else:
+            self._shared += 1
+            self._saved += sys.getsizeof(problem) + sys.getsizeof(raw)
+        return problem
+
+    def party(self, raw):
+        """
+        Returns the Party object for a raw party dict.
+        """
+
+        handles = tuple(sys.intern(x['handle']) for x in raw['members'])
+        # Gym ghosts have no members, only a teamName
+        key = (raw.get('contestId'), raw.get('participantType'), raw.get('teamId'), raw.get('teamName'),
+               raw.get('ghost'), handles, raw.get('startTimeSeconds'))
+        party = self._parties.get(key)
+        if party is None:
+            members = [Member(**dict(x, handle=handle)) for x, handle in zip(raw['members'], handles)]
+            party = self._parties[key] = Party(**dict(raw, members=members))
+        else:
+            self._shared += 1
+            self._saved += sys.getsizeof(party) + sys.getsizeof(raw)
+            if handles:
+                self._saved += len(handles) * sys.getsizeof(party.members[0])
+        return party
+
+    def clear(self):
+        """
+        Forgets every remembered object.
+        """
+
+        self._problems.clear()
+        self._parties.clear()
+
+    def _submission(self, raw):
+        return Submission(**dict(raw, problem=self.problem(raw['problem']), author=self.party(raw['author'])))
+
+    def _hack(self, raw):
+        hack = Hack(**raw)
+        hack.problem = self.problem(raw['problem'])
+        hack.hacker = self.party(raw['hacker'])
+        if 'defender' in raw:
+            hack.defender = self.party(raw['defender'])
+        return hack
+
+    def _row(self, raw):
+        return RanklistRow(**dict(raw, party=self.party(raw['party'])))
+
+class CallEvent:
+    """
+    What happened during one call, passed to the client's listeners.
+    Times are in seconds and are 0 for steps which didn't happen, e.g.
+    when the response came from the cache.
+    """
+
+    __slots__ = ('method', 'params', 'ok', 'cached', 'stale', 'retries', 'bytes', 'latency', 'decode', 'build', 'objects')
+
+    def __init__(self, method, params):
+        self.method = method        # String. API method, e.g. 'contest.standings'.
+        self.params = params        # Dict of the call's parameters.
+        self.ok = None              # Boolean. Whether the call succeeded.
+        self.cached = False         # Boolean. If true, the result came from the cache.
+        self.stale = False          # Boolean. If true, the result is the last good one, as Codeforces failed.
+        self.retries = 0            # Integer. Number of requests sent again after a failure.
+        self.bytes = 0              # Integer. Size of the response body.
+        self.latency = 0.0          # Floating point number. Time to send the request and receive the body.
+        self.decode = 0.0           # Floating point number. Time to decode the JSON.
+        self.build = 0.0            # Floating point number. Time to build Codeforces objects.
+        self.objects = 0            # Integer. Number of top-level objects built.
+
+    @property
+    def total(self):
+        return self.latency + self.decode + self.build
+
+class CallStats:
+    """
+    Listener keeping the timings of the last calls of each method:
+
+        stats = CallStats()
+        client.add_listener(stats)
+        ...
+        stats.report()
+
+    Parameter:
+    -   maxlen: 	Number of calls remembered per method.
+    """
+
+    FIELDS = ('total', 'latency', 'decode', 'build')
+
+    def __init__(self, maxlen = 10000):
+        self.maxlen = maxlen
+        self.events = collections.defaultdict(lambda: collections.deque(maxlen=self.maxlen))
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            self.events[event.method].append(event)
+
+    def percentiles(self, method, field = 'total', q = (50, 99)):
+        """
+        Returns the q-th percentiles of a timing field of method, in seconds.
+        """
+
+        with self._lock:
+            values = sorted(getattr(x, field) for x in self.events[method])
+        if not values:
+            return [None] * len(q)
+        return [values[min(len(values) - 1, len(values) * x // 100)] for x in q]
+
+    def report(self, file = None):
+        """
+        Prints p50/p99 of every timing of every method, in milliseconds.
+        """
+
+        print(f'{"method":26}{"calls":>7}' + ''.join(f'{x + " p50":>13}{"p99":>8}' for x in self.FIELDS), file=file)
+        for method in sorted(self.events):
+            line = f'{method:26}{len(self.events[method]):>7}'
+            for field in self.FIELDS:
+                p50, p99 = self.percentiles(method, field)
+                line += f'{p50 * 1e3:>13.1f}{p99 * 1e3:>8.1f}'
+            print(line, file=file)
+
+class _Client:
+    """
+    What the sync and the asyncio client have in common: throttling
+    settings and one method per Codeforces API method. Subclasses provide
+    request() and call().
+    """
+
+    def __init__(self, timeout = (10, 60), rate_limiter = default_rate_limiter, method_priorities = None,
+                 cache = None, interner = None, base_url = API_URL, listeners = (),
+                 output = 'objects', decoder = None, coalesce = True, retries = 3, backoff = (0.5, 8),
+                 circuit_breaker = default_circuit_breaker, serve_stale = 0):
+        if output not in OUTPUTS:
+            raise ValueError(f'output must be one of {OUTPUTS}')
+
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.circuit_breaker = circuit_breaker
+        self.serve_stale = serve_stale
+        self._good = collections.OrderedDict()      # Cache key -> last good result, see serve_stale
+        self._good_lock = threading.Lock()
+        self._refreshing = set()                    # Cache keys being refreshed in the background
+        self._stale = contextvars.ContextVar('stale', default=False)
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self._flights = {}
+        self._interned = {}
+        self.listeners = list(listeners)
+        self.output = output
+        self.decoder = decoder or json_decoder
+        self._output = contextvars.ContextVar('output', default=None)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.interner = interner
+        self.method_priorities = method_priorities or {}
+        self._priority = contextvars.ContextVar('priority', default=None)
+
+    @contextlib.contextmanager
+    def priority(self, priority):
+        """
+        Runs every call made inside the with-block at the given priority.
+        Smaller priorities are served first.
+        """
+
+        token = self._priority.set(priority)
+        try:
+            yield self
+        finally:
+            self._priority.reset(token)
+
+    @contextlib.contextmanager
+    def returning(self, output):
+        """
+        Makes every call inside the with-block return output instead of
+        the client's output, e.g. with client.returning('raw'): ...
+        """
+
+        if output not in OUTPUTS:
+            raise ValueError(f'output must be one of {OUTPUTS}')
+        token = self._output.set(output)
+        try:
+            yield self
+        finally:
+            self._output.reset(token)
+
+    def _output_of(self):
+        return self._output.get() or self.output
+
+    def _priority_of(self, method):
+        priority = self._priority.get()
+        if priority is None:
+            priority = self.method_priorities.get(method, 0)
+        return priority
+
+    def _result(self, method, params, info):
+        # Turns a decoded response into the (ok, result) tuple
+        if info['status'] != 'OK':
+            if self.rate_limiter is not None and info['comment'].startswith('Call limit exceeded'):
+                self.rate_limiter.penalize()
+            return False, info['comment']
+
+        if self.cache is not None:
+            self.cache.put(method, params, info['result'])
+        if self.serve_stale:
+            with self._good_lock:
+                key = _cache_key(method, params)
+                self._good[key] = info['result']
+                self._good.move_to_end(key)
+                if len(self._good) > self.serve_stale:
+                    self._good.popitem(last=False)
+        return True, info['result']
+
+    def is_stale(self):
+        """
+        Returns True if the last call made in this thread (or asyncio task)
+        returned a stale result, see serve_stale.
+        """
+
+        return self._stale.get()
+
+    def _delay(self, attempt):
+        # Exponential backoff with full jitter, so that clients which failed
+        # together don't retry together
+        base, cap = self.backoff
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+    def _retryable(self, ok, result):
+        # Codeforces didn't answer, or answered "Call limit exceeded"
+        return not ok and (result is None or result.startswith('Call limit exceeded'))
+
+    def _last_good(self, method, params, event, raw):
+        # Returns the (ok, result, stale) tuple of a failed call, answered
+        # with the last good result if there is one
+        if raw or not self.serve_stale:
+            return False, None, False
+        with self._good_lock:
+            key = _cache_key(method, params)
+            if key not in self._good:
+                return False, None, False
+            result = self._good[key]
+            refresh = key not in self._refreshing
+            self._refreshing.add(key)
+
+        if event is not None:
+            event.stale = True
+        if refresh:
+            self._revalidate(method, params, key)
+        return True, result, True
+
+    def add_listener(self, listener):
+        """
+        Calls listener(event) with a CallEvent after every call, e.g. a
+        CallStats. Timings are only taken while there are listeners.
+        """
+
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def _event(self, method, params):
+        if not self.listeners:
+            return None
+        return CallEvent(method, params)
+
+    def _emit(self, event, ok):
+        event.ok = ok
+        for listener in list(self.listeners):
+            listener(event)
+
+    def _build(self, build, result, event):
+        if event is None:
+            return build(result)
+
+        start = time.perf_counter()
+        result = build(result)
+        event.build = time.perf_counter() - start
+        event.objects = len(result) if isinstance(result, list) else sum(
+            len(x) if isinstance(x, list) else 1 for x in result) if isinstance(result, tuple) else 1
+        return result
+
+    def _builder(self, method):
+        # The same builder is returned every time, so that it can be part
+        # of the key of coalesced calls
+        if self.interner is not None:
+            key = (self.interner, method)
+            if key not in self._interned:
+                self._interned[key] = functools.partial(self.interner.build, method)
+            return self._interned[key]
+        return _BUILDERS[method]
+
+    def _flight_key(self, method, build, params, raw):
+        # Calls with the same key return the same result
+        params = _params(params)
+        return _cache_key(method, params), build, raw
+
+    def _decode(self, method, params, body, event, raw):
+        # Turns the body of a 200 response into the (ok, result) tuple
+        if raw:
+            result = _raw_result(body)
+            if result is not None:
+                return True, result
+
+        start = time.perf_counter()
+        info = self.decoder(body)
+        if event is not None:
+            event.decode = time.perf_counter() - start
+        if raw and info['status'] == 'OK':
+            return True, json.dumps(info['result'], ensure_ascii=False).encode()
+        return self._result(method, params, info)
+
+    def _failure(self, method, params, body):
+        # Codeforces answers FAILED calls with a 4xx status and the comment
+        # in the body. Anything else means Codeforces is down.
+        try:
+            info = json.loads(body)
+        except ValueError:
+            return False, None
+        if not isinstance(info, dict) or info.get('status') != 'FAILED' or not isinstance(info.get('comment'), str):
+            return False, None
+
+        return self._result(method, params, info)
+
+    def blogEntry_comments(self, blogEntryId):
+        return self.call('blogEntry.comments', blogEntryId=blogEntryId)
+
+    def blogEntry_view(self, blogEntryId):
+        return self.call('blogEntry.view', blogEntryId=blogEntryId)
+
+    def contest_hacks(self, contestId):
+        return self.call('contest.hacks', contestId=contestId)
+
+    def contest_list(self, gym = False):
+        return self.call('contest.list', gym=gym)
+
+    def contest_ratingChanges(self, contestId):
+        return self.call('contest.ratingChanges', contestId=contestId)
+
+    def contest_standings(self, contestId, **kwargs):
+        return self.call('contest.standings', contestId=contestId, **kwargs)
+
+    def contest_status(self, contestId, **kwargs):
+        return self.call('contest.status', contestId=contestId, **kwargs)
+
+    def problemset_problems(self, **kwargs):
+        return self.call('problemset.problems', **kwargs)
+
+    def problemset_recentStatus(self, count, problemsetName = None):
+        return self.call('problemset.recentStatus', count=count, problemsetName=problemsetName)
+
+    def recentActions(self, maxCount):
+        return self.call('recentActions', maxCount=maxCount)
+
+    def user_blogEntries(self, handle):
+        return self.call('user.blogEntries', handle=handle)
+
+    def user_info(self, handles):
+        return self.call('user.info', handles=handles)
+
+    def user_ratedList(self, activeOnly = True):
+        return self.call('user.ratedList', activeOnly=activeOnly)
+
+    def user_rating(self, handle):
+        return self.call('user.rating', handle=handle)
+
+    def user_status(self, handle, **kwargs):
+        return self.call('user.status', handle=handle, **kwargs)
+
+    def contest_status_table(self, contestId, **kwargs):
+        """
+        Same as contest_status(), but returns a SubmissionTable built
+        straight from the response, without Submission objects.
+        """
+
+        return self._call('contest.status', SubmissionTable.from_json, dict(kwargs, contestId=contestId))
+
+    def contest_standings_table(self, contestId, **kwargs):
+        """
+        Same as contest_standings(), but returns a StandingsTable built
+        straight from the response.
+        """
+
+        return self._call('contest.standings', StandingsTable.from_json, dict(kwargs, contestId=contestId))
+
+    def user_status_table(self, handle, **kwargs):
+        """
+        Same as user_status(), but returns a SubmissionTable.
+        """
+
+        return self._call('user.status', SubmissionTable.from_json, dict(kwargs, handle=handle))
+
+    def iter_contest_status(self, contestId, page_size = 1000, **kwargs):
+        """
+        Same as contest_status(), but yields the Submission objects one
+        page of page_size at a time while the next page is downloaded in
+        the background, so memory stays flat however big the contest is.
+        "from" and "count" are still honored. Raises CodeforcesError if
+        a page can't be fetched.
+        """
+
+        return self._pages('contest.status', page_size, dict(kwargs, contestId=contestId))
+
+    def iter_user_status(self, handle, page_size = 1000, **kwargs):
+        """
+        Same as user_status(), but pages through the submissions like
+        iter_contest_status().
+        """
+
+        return self._pages('user.status', page_size, dict(kwargs, handle=handle))
+
+    def _windows(self, page_size, params):
+        # Splits "from" and "count" into (from, count) windows of page_size
+        start = params.pop('from', 1)
+        end = params.pop('count', None)
+        if end is not None:
+            end += start
+        while end is None or start < end:
+            count = page_size if end is None else min(page_size, end - start)
+            yield start, count
+            start += count
+
+    def _user_info_steps(self, batch):
+        # The calls of one user_info_bulk() batch, shared by the sync and
+        # async clients: yields the handles to call user.info with and is
+        # sent the (ok, result) of each call. A batch failing on an unknown
+        # handle is split in halves without it, so that further unknown
+        # handles only cost a retry of their half.
+        users = {}
+        unknown = []
+        pending = [batch]
+        while pending:
+            batch = pending.pop()
+            ok, result = yield batch
+            if ok:
+                users.update(zip(batch, result))
+                continue
+
+            handle = _unknown_handle(result, batch)
+            if handle is None:
+                return False, result
+            unknown.append(handle)
+            batch = [x for x in batch if x is not handle]
+            middle = len(batch) // 2
+            pending.extend(x for x in (batch[middle:], batch[:middle]) if x)
+
+        return True, (users, unknown)
+
+def _raw_result(body):
+    # Cuts the "result" value out of a successful response without decoding
+    # it. Codeforces always writes {"status":"OK","result":...} this way.
+    match = _RAW_PREFIX.match(body)
+    body = body.rstrip()
+    if match is None or not body.endswith(b'}'):
+        return None
+    return body[match.end():-1].strip()
+
+_RAW_PREFIX = re.compile(rb'\s*\{\s*"status"\s*:\s*"OK"\s*,\s*"result"\s*:')
+
+def _parse_result(method, body, tables, decoder):
+    # Runs in the processes of CodeforcesClient.crawl_contests()
+    result = decoder(body)
+    if tables and np is not None and method in _TABLES:
+        return _TABLES[method].from_json(result)
+    return _BUILDERS[method](result)
+
+def _handle_batches(handles, max_url_length):
+    # Dedupes handles (they are case-insensitive) and splits them into
+    # batches whose joined length fits in an URL and the API's 10000 limit
+    seen = set()
+    batch = []
+    length = 0
+    for handle in handles:
+        if handle.lower() in seen:
+            continue
+        seen.add(handle.lower())
+
+        size = len(requests.utils.quote(handle, safe='')) + 3     # ';' is sent as %3B
+        if batch and (length + size > max_url_length or len(batch) == 10000):
+            yield batch
+            batch = []
+            length = 0
+        batch.append(handle)
+        length += size
+
+    if batch:
+        yield batch
+
+def _unknown_handle(comment, batch):
+    # Finds the handle named in "handles: User with handle ... not found"
+    match = re.match(r'handles: User with handle (.+) not found', comment or '')
+    if match is None:
+        return None
+    name = match.group(1).lower()
+    return next((x for x in batch if x.lower() == name), None)
+
+def _merge_batches(results):
+    users = {}
+    unknown = []
+    for ok, result in results:
+        if not ok:
+            return False, result
+        users.update(result[0])
+        unknown += result[1]
+    return True, (users, unknown)
+
+class CodeforcesError(Exception):
+    """
+    Raised by the iterators, which can't return a (False, comment) tuple.
+    Arguments are the method name and Codeforces' comment (None if
+    Codeforces didn't answer).
+    """
+
+class _JSONStream:
+    """
+    Decodes a JSON document piece by piece from an iterator of byte chunks,
+    so that a huge array can be consumed one element at a time.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, chunks, close = None):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._close = close
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def value(self):
+        """
+        Decodes the next value.
+        """
+
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # A number at the end of the buffer may go on in the next chunk
+            if end == len(self._buffer) and self._more():
+                continue
+            self._pos = end
+            return value
+
+    def object_items(self):
+        """
+        Walks the next object, yielding its keys. The caller must consume
+        the value of each key before asking for the next one.
+        """
+
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(':')
+            yield key
+            if self._separator('}'):
+                return
+
+    def array_items(self):
+        """
+        Walks the next array, yielding its decoded elements. Closes the
+        stream when the array ends or the generator is closed.
+        """
+
+        try:
+            self._expect('[')
+            if self._peek() == ']':
+                self._pos += 1
+                return
+            while True:
+                yield self.value()
+                if self._separator(']'):
+                    return
+        finally:
+            self.close()
+
+    def _more(self):
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _peek(self):
+        # Skips whitespace and returns the next character
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\n\r':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._more():
+                raise ValueError('Unexpected end of JSON')
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f'Expected {char!r} at position {self._pos}')
+        self._pos += 1
+
+    def _separator(self, end):
+        # Consumes ',' or end, returns True for end
+        char = self._peek()
+        if char != ',' and char != end:
+            raise ValueError(f'Expected {end!r} at position {self._pos}')
+        self._pos += 1
+        return char == end
+
+def _new_submissions(result, last):
+    # Submissions are sorted by decreasing id. If new ones were made while
+    # paging, older ones shift into the next window and must be skipped.
+    if last is None:
+        return result
+    return [x for x in result if x.id < last]
+
+class _Flight:
+    # A call in flight, which identical calls wait for
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class CodeforcesClient(_Client):
+    """
+    Owns a pooled keep-alive HTTP session to Codeforces, so consecutive
+    calls reuse an open connection instead of doing a new TCP+TLS
+    handshake. Every API method is available as a method of the client
+    and returns the same tuple as the module-level function.
+
+    Calls are throttled by a RateLimiter. Its priority is taken from
+    method_priorities, or set for a block of code with priority().
+
+    Parameter:
+    -   pool_connections: 	Number of per-host connection pools to keep.
+    -   pool_maxsize: 	Maximum number of idle connections kept alive per host.
+    -   timeout: 	Seconds to wait for Codeforces. Either one number or a (connect, read) tuple.
+    -   rate_limiter: 	RateLimiter used by every call. By default all clients share
+                        default_rate_limiter, as the quota is per IP. None disables throttling.
+    -   method_priorities: 	Dict from method name (e.g. 'contest.standings') to its priority.
+    -   cache: 	ResponseCache answering repeated calls locally. None disables caching.
+    -   interner: 	Interner sharing repeated problems and parties between results.
+    -   base_url: 	Where the API lives, e.g. a local stand-in server for benchmarks.
+    -   listeners: 	Functions called with a CallEvent after every call, see add_listener().
+    -   output: 	What the API methods return: 'objects' (Codeforces objects), 'dicts' (the
+                        decoded "result" field) or 'raw' (its undecoded bytes), see returning().
+    -   decoder: 	Function decoding a response body. Defaults to json_decoder.
+    -   coalesce: 	If true, identical calls made while one is in flight share its
+                        request and its result instead of sending their own.
+    -   retries: 	Number of times a call is sent again when Codeforces doesn't answer
+                        (5xx, timeout, ...) or answers "Call limit exceeded".
+    -   backoff: 	(base, cap) in seconds. Retry n waits a random time up to min(cap, base * 2^n).
+    -   circuit_breaker: 	CircuitBreaker shared by the clients, None disables it.
+    -   serve_stale: 	Number of last good results kept. When a call fails, its last good
+                        result is returned instead and refreshed in the background;
+                        is_stale() tells whether that happened. 0 disables it.
+    """
+
+    def __init__(self, pool_connections = 10, pool_maxsize = 10, **options):
+        super().__init__(**options)
+        self._flights_lock = threading.Lock()
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Closes every pooled connection.
+        """
+
+        self.session.close()
+
+    def stats(self):
+        """
+        Returns connection reuse statistics of the pool.
+        Return value: A dict with the number of requests sent, connections
+        opened, requests which were served by an already open connection
+        and calls which shared the request of an identical call.
+        """
+
+        pools = self._adapter.poolmanager.pools
+        pools = [pools[key] for key in pools.keys()]
+        sent = sum(pool.num_requests for pool in pools)
+        opened = sum(pool.num_connections for pool in pools)
+        return {
+            'requests': sent,
+            'connections': opened,
+            'reused': sent - opened,
+            'coalesced': self.coalesced,
+        }
+
+    def request(self, method, **params):
+        """
+        Calls any Codeforces API method and returns the undecoded "result"
+        field of the response, e.g. request('contest.list', gym=True).
+        Results may come from the cache or be shared with identical calls
+        made at the same time, so don't modify them.
+        """
+
+        return self._call(method, None, params)
+
+    def _request(self, method, params, event, raw = False, revalidate = False):
+        # Returns (ok, result, stale). revalidate is set by the background
+        # refresh of a stale result, which must not serve stale results itself.
+        params = _params(params)
+        if self.cache is None or raw:
+            return self._send(method, params, event, raw, revalidate)
+
+        # Waits while another process sharing the cache fetches the call
+        while True:
+            hit, result = self.cache.get(method, params)
+            if hit:
+                if event is not None:
+                    event.cached = True
+                return True, result, False
+            if self.cache.claim(method, params):
+                break
+            time.sleep(self.cache.poll_interval)
+
+        try:
+            return self._send(method, params, event, raw, revalidate)
+        finally:
+            self.cache.release(method, params)
+
+    def _send(self, method, params, event, raw, revalidate):
+        breaker = self.circuit_breaker
+        if breaker is None or breaker.allow():
+            try:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        time.sleep(self._delay(attempt))
+                    ok, result = self._attempt(method, params, event, raw)
+                    if not self._retryable(ok, result):
+                        break
+            except BaseException:
+                # Cancelled or crashed, the breaker must not wait on this call
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            if event is not None:
+                event.retries = attempt
+            if breaker is not None:
+                breaker.record(ok or result is not None)
+            if ok or result is not None or revalidate:
+                return ok, result, False
+        elif revalidate:
+            return False, None, False
+
+        return self._last_good(method, params, event, raw)
+
+    def _attempt(self, method, params, event, raw):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self._priority_of(method))
+
+        start = time.perf_counter()
+        try:
+            info = self.session.get(self.base_url + method, params=params, timeout=self.timeout)
+        except requests.RequestException:
+            return False, None
+        if event is not None:
+            event.latency = time.perf_counter() - start
+            event.bytes = len(info.content)
+        if info.status_code != 200:
+            return self._failure(method, params, info.content)
+
+        try:
+            return self._decode(method, params, info.content, event, raw)
+        except (ValueError, KeyError, TypeError):
+            # Not JSON (e.g. a maintenance page) or not shaped like an answer
+            return False, None
+
+    def _revalidate(self, method, params, key):
+        def refresh():
+            try:
+                self._request(method, params, None, revalidate=True)
+            finally:
+                with self._good_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def stream(self, method, **params):
+        """
+        Like request(), but doesn't download the response up front. The
+        result is a _JSONStream positioned at the "result" field, which is
+        decoded as the caller reads it. The cache is not used, and neither
+        are the listeners, retries, circuit breaker or stale results: a
+        failed download returns (False, None) at once.
+        """
+
+        params = _params(params)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self._priority_of(method))
+
+        try:
+            info = self.session.get(self.base_url + method, params=params, timeout=self.timeout, stream=True)
+        except requests.RequestException:
+            return False, None
+        if info.status_code != 200:
+            body = info.content
+            info.close()
+            return self._failure(method, params, body)
+
+        stream = _JSONStream(info.iter_content(65536), info.close)
+        try:
+            for key in stream.object_items():
+                if key == 'result':
+                    return True, stream
+                value = stream.value()
+                if key == 'comment':
+                    stream.close()
+                    return self._result(method, params, {'status': 'FAILED', 'comment': value})
+        except (ValueError, requests.RequestException):
+            # Not JSON, or the connection dropped before the result
+            stream.close()
+            return False, None
+        except BaseException:
+            stream.close()
+            raise
+
+        stream.close()
+        return False, None
+
+    def stream_user_ratedList(self, activeOnly = True):
+        """
+        Same as user_ratedList(), but the response is decoded while it is
+        downloaded, so peak memory stays a fraction of the payload.
+        Return value: A generator of User objects. Exhaust or close() it to
+        release the connection.
+        """
+
+        ok, stream = self.stream('user.ratedList', activeOnly=activeOnly)
+        if not ok:
+            return False, stream
+
+        return True, (User(**x) for x in stream.array_items())
+
+    def stream_contest_standings(self, contestId, **kwargs):
+        """
+        Same as contest_standings(), but the rows are decoded while they are
+        downloaded, see stream_user_ratedList().
+        Return value: Returns the Contest object, the list of Problem
+        objects and a generator of RanklistRow objects.
+        """
+
+        ok, stream = self.stream('contest.standings', contestId=contestId, **kwargs)
+        if not ok:
+            return False, stream
+
+        fields = {}
+        rows = None
+        try:
+            for key in stream.object_items():
+                if key == 'rows' and 'contest' in fields and 'problems' in fields:
+                    rows = stream.array_items()
+                    break
+                fields[key] = stream.value()
+        except (ValueError, requests.RequestException):
+            # Cut off, or the connection dropped before the rows
+            return False, None
+        finally:
+            if rows is None:
+                stream.close()
+        if rows is None:
+            if not {'contest', 'problems', 'rows'} <= fields.keys():
+                return False, None
+            rows = fields['rows']
+
+        result = (
+            Contest(**fields['contest']),
+            [Problem(**x) for x in fields['problems']],
+            (RanklistRow(**x) for x in rows)
+        )
+        return True, result
+
+    def call(self, method, **params):
+        """
+        Like request(), but converts the result to Codeforces objects, or
+        to the client's output (see returning()).
+        """
+
+        output = self._output_of()
+        return self._call(method, self._builder(method) if output == 'objects' else None, params, output == 'raw')
+
+    def _call(self, method, build, params, raw = False):
+        ok, result, stale = self._shared(method, build, params, raw)
+        self._stale.set(stale)
+        return ok, result
+
+    def _shared(self, method, build, params, raw):
+        # Identical calls made while one is in flight wait for its result
+        # instead of sending their own request
+        if not self.coalesce:
+            return self._fetch(method, build, params, raw)
+
+        key = self._flight_key(method, build, params, raw)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._fetch(method, build, params, raw)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def _fetch(self, method, build, params, raw):
+        # build is None to return the result as it is
+        event = self._event(method, params)
+        ok, result, stale = self._request(method, params, event, raw)
+        if ok and build is not None:
+            result = self._build(build, result, event)
+        if event is not None:
+            self._emit(event, ok)
+        return ok, result, stale
+
+    def user_info_bulk(self, handles, max_url_length = 7000, max_workers = 4):
+        """
+        Returns information about any number of users. Handles are deduped,
+        split into batches which fit in an URL, and the batches are fetched
+        concurrently within the rate limit. Unknown handles are dropped from
+        their batch instead of failing it, and the rest of the batch is
+        retried in halves.
+        Return value: A dict from requested handle to User object and the
+        list of handles which don't exist.
+
+        Parameter:
+        -   handles (Required): 	Iterable of handles.
+        -   max_url_length: 	Maximum length of the handles parameter of one call.
+        -   max_workers: 	Number of batches fetched at the same time.
+        """
+
+        batches = _handle_batches(handles, max_url_length)
+        context = contextvars.copy_context()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            results = [pool.submit(context.copy().run, self._user_info_batch, x) for x in batches]
+            return _merge_batches(x.result() for x in results)
+
+    def _user_info_batch(self, batch):
+        steps = self._user_info_steps(batch)
+        build = self._builder('user.info')
+        try:
+            batch = next(steps)
+            while True:
+                batch = steps.send(self._call('user.info', build, {'handles': ';'.join(batch)}))
+        except StopIteration as stop:
+            return stop.value
+
+    def crawl_contests(self, contestIds, methods = ('contest.ratingChanges', 'contest.standings'),
+                       params = None, tables = True, processes = None, max_workers = 4):
+        """
+        Fetches several methods for many contests, e.g. to backfill every
+        contest of contest_list(). Responses are downloaded by max_workers
+        threads, while decoding them and building the objects is spread
+        over a pool of processes, so it isn't bound to one core by the GIL.
+        Call it from under "if __name__ == '__main__':", as the processes
+        may import the calling script. The processes decode with the
+        client's decoder, which must be picklable (e.g. a module-level
+        function, not a lambda).
+        Return value: A generator of (contestId, method, ok, result) tuples,
+        in the order the results are ready. Failed calls don't stop it.
+
+        Parameter:
+        -   contestIds (Required): 	Iterable of contest ids.
+        -   methods: 	Methods taking a contestId to call for each contest.
+        -   params: 	Dict from method to its other parameters, e.g. {'contest.standings': {'showUnofficial': True}}.
+        -   tables: 	If true (and numpy is installed), contest.standings and
+                        contest.status results are a StandingsTable or a SubmissionTable.
+                        They are sent back from the processes ~100 times faster than
+                        objects, whose unpickling costs about as much as building them.
+        -   processes: 	Number of processes. Defaults to the number of cores.
+        -   max_workers: 	Number of downloads in flight.
+        """
+
+        jobs = ((contestId, method) for contestId in contestIds for method in methods)
+        params = params or {}
+        processes = processes or os.cpu_count() or 1
+        context = contextvars.copy_context()
+
+        def fetch(job):
+            with self.returning('raw'):
+                return self.call(job[1], contestId=job[0], **params.get(job[1], {}))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as fetchers, \
+             concurrent.futures.ProcessPoolExecutor(processes) as parsers:
+            # Downloads are only started when a result is handed out, so
+            # that bodies don't pile up when parsing is slower
+            pending = {}
+            def start():
+                job = next(jobs, None)
+                if job is not None:
+                    pending[fetchers.submit(context.copy().run, fetch, job)] = (job, False)
+
+            for _ in range(max_workers + processes * 2):
+                start()
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    job, parsed = pending.pop(future)
+                    if parsed:
+                        try:
+                            result = True, future.result()
+                        except Exception:
+                            # A body which doesn't parse fails only its own call
+                            result = False, None
+                        yield job + result
+                        start()
+                        continue
+
+                    ok, body = future.result()
+                    if ok:
+                        pending[parsers.submit(_parse_result, job[1], body, tables, self.decoder)] = (job, True)
+                    else:
+                        yield job + (False, body)
+                        start()
+
+    def _pages(self, method, page_size, params):
+        windows = self._windows(page_size, params)
+        build = self._builder(method)
+        fetch = lambda window: self._call(method, build, dict(params, **{'from': window[0], 'count': window[1]}))
+        context = contextvars.copy_context()
+        last = None
+
+        with concurrent.futures.ThreadPoolExecutor(1) as prefetcher:
+            window = next(windows, None)
+            page = window and prefetcher.submit(context.run, fetch, window)
+            while page is not None:
+                ok, result = page.result()
+                if not ok:
+                    raise CodeforcesError(method, result)
+
+                count = window[1]
+                window = next(windows, None) if len(result) == count else None
+                page = window and prefetcher.submit(context.run, fetch, window)
+
+                result = _new_submissions(result, last)
+                if result:
+                    last = result[-1].id
+                yield from result
+
+class AsyncCodeforcesClient(_Client):
+    """
+    asyncio version of CodeforcesClient, built on aiohttp. It has the
+    same methods, which have to be awaited, and many calls can be in
+    flight on one event loop:
+
+        async with AsyncCodeforcesClient() as client:
+            ok, rows = await client.contest_standings(566, count=10)
+
+    It returns the same Codeforces objects and shares the rate limiter
+    with the sync clients of the process. Parameters are the same as
+    for CodeforcesClient, except pool_maxsize which bounds the number of
+    connections open at once.
+    """
+
+    def __init__(self, pool_maxsize = 10, **options):
+        if aiohttp is None:
+            raise ImportError('AsyncCodeforcesClient requires aiohttp')
+
+        super().__init__(**options)
+        self.pool_maxsize = pool_maxsize
+        self.session = None
+        self._tasks = set()
+        self._requests = 0
+        self._connections = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes every pooled connection.
+        """
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def stats(self):
+        """
+        Returns connection reuse statistics of the pool, see CodeforcesClient.stats().
+        """
+
+        return {
+            'requests': self._requests,
+            'connections': self._connections,
+            'reused': self._requests - self._connections,
+            'coalesced': self.coalesced,
+        }
+
+    async def request(self, method, **params):
+        """
+        Calls any Codeforces API method and returns the undecoded "result"
+        field of the response, e.g. await request('contest.list', gym=True).
+        """
+
+        return await self._call(method, None, params)
+
+    async def _request(self, method, params, event, raw = False, revalidate = False):
+        params = _params(params)
+        if self.cache is None or raw:
+            return await self._send(method, params, event, raw, revalidate)
+
+        # Waits while another process sharing the cache fetches the call
+        while True:
+            hit, result = self.cache.get(method, params)
+            if hit:
+                if event is not None:
+                    event.cached = True
+                return True, result, False
+            if self.cache.claim(method, params):
+                break
+            await asyncio.sleep(self.cache.poll_interval)
+
+        try:
+            return await self._send(method, params, event, raw, revalidate)
+        finally:
+            self.cache.release(method, params)
+
+    async def _send(self, method, params, event, raw, revalidate):
+        breaker = self.circuit_breaker
+        if breaker is None or breaker.allow():
+            try:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        await asyncio.sleep(self._delay(attempt))
+                    ok, result = await self._attempt(method, params, event, raw)
+                    if not self._retryable(ok, result):
+                        break
+            except BaseException:
+                # Cancelled or crashed, the breaker must not wait on this call
+                if breaker is not None:
+                    breaker.record(False)
+                raise
+            if event is not None:
+                event.retries = attempt
+            if breaker is not None:
+                breaker.record(ok or result is not None)
+            if ok or result is not None or revalidate:
+                return ok, result, False
+        elif revalidate:
+            return False, None, False
+
+        return self._last_good(method, params, event, raw)
+
+    async def _attempt(self, method, params, event, raw):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(self._priority_of(method))
+
+        start = time.perf_counter()
+        try:
+            async with self._session().get(self.base_url + method, params=params) as info:
+                body = await info.read()
+                status = info.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False, None
+        if event is not None:
+            event.latency = time.perf_counter() - start
+            event.bytes = len(body)
+        if status != 200:
+            return self._failure(method, params, body)
+
+        try:
+            return self._decode(method, params, body, event, raw)
+        except (ValueError, KeyError, TypeError):
+            return False, None
+
+    def _revalidate(self, method, params, key):
+        async def refresh():
+            try:
+                await self._request(method, params, None, revalidate=True)
+            finally:
+                with self._good_lock:
+                    self._refreshing.discard(key)
+
+        # Tasks are only weakly referenced by the loop
+        task = asyncio.ensure_future(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def call(self, method, **params):
+        """
+        Like request(), but converts the result to Codeforces objects, or
+        to the client's output (see returning()).
+        """
+
+        output = self._output_of()
+        return await self._call(method, self._builder(method) if output == 'objects' else None, params, output == 'raw')
+
+    async def _call(self, method, build, params, raw = False):
+        if not self.coalesce:
+            ok, result, stale = await self._fetch(method, build, params, raw)
+        else:
+            key = self._flight_key(method, build, params, raw)
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                flight = self._flights[key] = asyncio.ensure_future(self._fetch(method, build, params, raw))
+                flight.add_done_callback(lambda _: self._flights.pop(key, None))
+            # A cancelled caller doesn't cancel the call the others wait for
+            ok, result, stale = await asyncio.shield(flight)
+        self._stale.set(stale)
+        return ok, result
+
+    async def _fetch(self, method, build, params, raw):
+        event = self._event(method, params)
+        ok, result, stale = await self._request(method, params, event, raw)
+        if ok and build is not None:
+            result = self._build(build, result, event)
+        if event is not None:
+            self._emit(event, ok)
+        return ok, result, stale
+
+    async def user_info_bulk(self, handles, max_url_length = 7000, max_workers = 4):
+        """
+        Returns information about any number of users, see
+        CodeforcesClient.user_info_bulk().
+        """
+
+        semaphore = asyncio.Semaphore(max_workers)
+        async def fetch(batch):
+            async with semaphore:
+                return await self._user_info_batch(batch)
+
+        results = await asyncio.gather(*[fetch(x) for x in _handle_batches(handles, max_url_length)])
+        return _merge_batches(results)
+
+    async def _user_info_batch(self, batch):
+        steps = self._user_info_steps(batch)
+        build = self._builder('user.info')
+        try:
+            batch = next(steps)
+            while True:
+                batch = steps.send(await self._call('user.info', build, {'handles': ';'.join(batch)}))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _pages(self, method, page_size, params):
+        windows = self._windows(page_size, params)
+        build = self._builder(method)
+        fetch = lambda window: self._call(method, build, dict(params, **{'from': window[0], 'count': window[1]}))
+        last = None
+
+        window = next(windows, None)
+        page = window and asyncio.ensure_future(fetch(window))
+        try:
+            while page is not None:
+                ok, result = await page
+                if not ok:
+                    raise CodeforcesError(method, result)
+
+                count = window[1]
+                window = next(windows, None) if len(result) == count else None
+                page = window and asyncio.ensure_future(fetch(window))
+
+                result = _new_submissions(result, last)
+                if result:
+                    last = result[-1].id
+                for x in result:
+                    yield x
+        finally:
+            if page is not None:
+                page.cancel()
+
+    def _session(self):
+        # aiohttp sessions must be created inside the running event loop
+        if self.session is None:
+            if isinstance(self.timeout, tuple):
+                timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+            else:
+                timeout = aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request)
+            trace.on_connection_create_end.append(self._on_connection)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=timeout,
+                trace_configs=[trace],
+            )
+        return self.session
+
+    async def _on_request(self, session, context, params):
+        self._requests += 1
+
+    async def _on_connection(self, session, context, params):
+        self._connections += 1
+
+def _param(value):
+    # Codeforces only understands lowercase booleans
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+def _params(params):
+    # The query string of a call: None means the parameter is left out
+    return {x: _param(params[x]) for x in params if params[x] is not None}
+
+def _many(cls):
+    return lambda result: [cls(**x) for x in result]
+
+def _standings(result):
+    return (
+        Contest(**result['contest']),
+        [Problem(**x) for x in result['problems']],
+        [RanklistRow(**x) for x in result['rows']]
+    )
+
+def _problemset(result):
+    return (
+        [Problem(**x) for x in result['problems']],
+        [ProblemStatistics(**x) for x in result['problemStatistics']]
+    )
+
+# How the "result" field of every method is turned into Codeforces objects
+_BUILDERS = {
+    'blogEntry.comments':       _many(Comment),
+    'blogEntry.view':           lambda result: BlogEntry(**result),
+    'contest.hacks':            _many(Hack),
+    'contest.list':             _many(Contest),
+    'contest.ratingChanges':    _many(RatingChange),
+    'contest.standings':        _standings,
+    'contest.status':           _many(Submission),
+    'problemset.problems':      _problemset,
+    'problemset.recentStatus':  _many(Submission),
+    'recentActions':            _many(RecentAction),
+    'user.blogEntries':         _many(BlogEntry),
+    'user.info':                _many(User),
+    'user.ratedList':           _many(User),
+    'user.rating':              _many(RatingChange),
+    'user.status':              _many(Submission),
+}
+
+# Tables which crawl_contests(tables=True) builds instead of objects
+_TABLES = {
+    'contest.standings':        StandingsTable,
+    'contest.status':           SubmissionTable,
+}
+
+# Client used by the module-level functions
+default_client = CodeforcesClient()
+
+"""
+Tools built on top of the client
+"""
+
+def _party_key(party):
+    # Identifies a party across polls from its raw dict. Gym ghosts have
+    # no members, only a teamName.
+    return (party.get('participantType'), party.get('teamId'), tuple(x['handle'] for x in party['members']),
+            party.get('teamName'), party.get('ghost'))
+
+class StandingsTracker:
+    """
+    Follows the standings of a live contest. Each poll fetches
+    contest.standings and compares every row with the previous poll by its
+    raw dict, so RanklistRow objects are only built for rows which changed
+    (rank, points, problem results, hacks, ...). Unchanged rows keep their
+    objects. Subscribers are called with the changes of each poll:
+
+        tracker = StandingsTracker(client, 566, showUnofficial=True)
+        tracker.subscribe(lambda changes: print(len(changes), 'rows changed'))
+        tracker.run(interval=5)
+
+    A change is a (previous, current) pair of RanklistRow objects, where
+    previous is None for a new party and current is None for a party which
+    left the standings.
+    """
+
+    def __init__(self, client, contestId, **kwargs):
+        self.client = client
+        self.contestId = contestId
+        self.params = kwargs
+        self.contest = None
+        self.problems = None
+        self.rows = {}          # Party key -> RanklistRow
+        self._raw = {}          # Party key -> raw row of the last poll
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Calls callback(changes) after every poll which changed something.
+        """
+
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def poll(self):
+        """
+        Fetches the standings once and applies them.
+        Return value: The list of changes.
+        """
+
+        ok, result = self.client.request('contest.standings', contestId=self.contestId, **self.params)
+        if not ok:
+            return False, result
+
+        return True, self.apply(result)
+
+    def apply(self, result):
+        """
+        Applies the "result" field of a contest.standings response, e.g.
+        one fetched with an AsyncCodeforcesClient.
+        Return value: The list of changes.
+        """
+
+        self.contest = Contest(**result['contest'])
+        if self.problems is None or len(self.problems) != len(result['problems']):
+            self.problems = [Problem(**x) for x in result['problems']]
+
+        changes = []
+        raw = {}
+        rows = {}
+        for row in result['rows']:
+            key = _party_key(row['party'])
+            raw[key] = row
+            if self._raw.get(key) == row:
+                rows[key] = self.rows[key]
+            else:
+                rows[key] = RanklistRow(**row)
+                changes.append((self.rows.get(key), rows[key]))
+
+        for key in self.rows.keys() - rows.keys():
+            changes.append((self.rows[key], None))
+
+        self.rows = rows
+        self._raw = raw
+        if changes:
+            for callback in list(self._subscribers):
+                callback(changes)
+        return changes
+
+    def ranklist(self):
+        """
+        Returns the RanklistRow objects of the last poll, sorted by rank.
+        """
+
+        return sorted(self.rows.values(), key=lambda x: x.rank)
+
+    def run(self, interval = 5, stop = None):
+        """
+        Polls every interval seconds until the threading.Event stop is set,
+        or forever.
+        """
+
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.poll()
+            stop.wait(interval)
+
+class _Tail:
+    """
+    One polled method of a Firehose and what it has seen: the keys of the
+    last items in a ring buffer (a deque, with a set for lookups), and the
+    observed arrival rate which sets the polling interval.
+    """
+
+    def __init__(self, method, params, window, cls, key, memory, interval):
+        self.method = method
+        self.params = params
+        self.window = window            # Number of items one poll returns
+        self.cls = cls
+        self.key = key
+        self.order = collections.deque(maxlen=memory)
+        self.seen = set()
+        self.rate = None                # New items per second
+        self.interval = interval
+        self.last = None                # Time of the last successful poll
+        self.next = 0                   # Time of the next poll
+
+    def remember(self, key):
+        if len(self.order) == self.order.maxlen:
+            self.seen.discard(self.order[0])
+        self.order.append(key)
+        self.seen.add(key)
+
+def _submission_key(x):
+    return x['id']
+
+def _action_key(x):
+    return (x['timeSeconds'], x.get('blogEntry', {}).get('id'), x.get('comment', {}).get('id'))
+
+class Firehose:
+    """
+    Live feed of new submissions (problemset.recentStatus) and new blog
+    activity (recentActions). Consecutive polls return mostly the same
+    items, so items are deduped on their raw dicts by submission id and by
+    action time, and only new ones are built into Submission and
+    RecentAction objects and passed to the subscribers, oldest first:
+
+        firehose = Firehose(client)
+        firehose.subscribe(lambda new: print(len(new), 'new'))
+        firehose.run()
+
+    Each method is polled on its own schedule, so that about half of its
+    window is new at each poll, from the arrival rate seen so far. A poll
+    with nothing known in a full window may have missed items, so the
+    next one comes as early as allowed.
+
+    Parameter:
+    -   client: 	Client to fetch with.
+    -   count: 	Number of submissions asked for by each poll (at most 1000).
+    -   maxCount: 	Number of actions asked for by each poll (at most 100).
+    -   min_interval, max_interval: 	Bounds of the time between two polls of a method, in seconds.
+    -   memory: 	Number of keys remembered per method. Must be more than one window.
+    -   final_only: 	If true, submissions are held back until they have a final verdict.
+    -   problemsetName: 	Short name of the problemset, see problemset_recentStatus().
+    """
+
+    def __init__(self, client, count = 1000, maxCount = 100, min_interval = 2, max_interval = 60,
+                 memory = 20000, final_only = False, problemsetName = None):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.final_only = final_only
+        self.tails = {
+            'problemset.recentStatus': _Tail('problemset.recentStatus', {'count': count, 'problemsetName': problemsetName},
+                                             count, Submission, _submission_key, memory, min_interval),
+            'recentActions': _Tail('recentActions', {'maxCount': maxCount},
+                                   maxCount, RecentAction, _action_key, memory, min_interval),
+        }
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """
+        Calls callback(new) with the list of new Submission or RecentAction
+        objects of every poll which found some.
+        """
+
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def poll(self, method):
+        """
+        Polls method ('problemset.recentStatus' or 'recentActions') once.
+        Return value: The list of new objects, oldest first.
+        """
+
+        tail = self.tails[method]
+        ok, result = self.client.request(method, **tail.params)
+        now = time.monotonic()
+        if not ok:
+            tail.interval = min(tail.interval * 2, self.max_interval)
+            tail.next = now + tail.interval
+            return False, result
+
+        return True, self.apply(method, result, now)
+
+    def apply(self, method, result, now = None):
+        """
+        Applies the "result" field of a response of method, e.g. one
+        fetched with an AsyncCodeforcesClient.
+        Return value: The list of new objects, oldest first.
+        """
+
+        tail = self.tails[method]
+        now = time.monotonic() if now is None else now
+        new = []
+        known = 0
+        for x in result:
+            key = tail.key(x)
+            if key in tail.seen:
+                known += 1
+            elif not (self.final_only and tail.cls is Submission and x.get('verdict', 'TESTING') == 'TESTING'):
+                tail.remember(key)
+                new.append(x)
+
+        gap = tail.last is not None and known == 0 and len(result) >= tail.window
+        self._schedule(tail, len(new), gap, now)
+        new = [tail.cls(**x) for x in reversed(new)]
+        if new:
+            for callback in list(self._subscribers):
+                callback(new)
+        return new
+
+    def run(self, stop = None):
+        """
+        Polls every method when it is due until the threading.Event stop
+        is set, or forever.
+        """
+
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            tail = min(self.tails.values(), key=lambda x: x.next)
+            if stop.wait(max(0, tail.next - time.monotonic())):
+                break
+            self.poll(tail.method)
+
+    def _schedule(self, tail, new, gap, now):
+        # Moves the arrival rate towards this poll's and picks the interval
+        # after which about half a window should be new
+        if tail.last is not None:
+            rate = new / max(now - tail.last, 1e-3)
+            tail.rate = rate if tail.rate is None else 0.7 * tail.rate + 0.3 * rate
+        tail.last = now
+
+        if gap:
+            tail.interval = self.min_interval
+        elif tail.rate:
+            tail.interval = tail.window / 2 / tail.rate
+        else:
+            tail.interval *= 2
+        tail.interval = min(max(tail.interval, self.min_interval), self.max_interval)
+        tail.next = now + tail.interval
+
+def _object_party_key(party):
+    # Same as _party_key() for a Party object
+    return (party.participantType, party.teamId, tuple(x.handle for x in party.members),
+            party.teamName, party.ghost)
+
+class StandingsReplay:
+    """
+    Standings of a finished contest at any moment, rebuilt from its
+    submissions. Submissions are applied in time order as events, each
+    updating one (party, problem) cell, the party's total and its place in
+    a sorted ranking. Every event keeps what it overwrote in an undo log,
+    so seek() moves to any time by only applying or undoing the events in
+    between, and scrubbing a timeline costs the events of each step, not a
+    full recompute:
+
+        ok, replay = StandingsReplay.fetch(client, 566)
+        replay.seek(3600)           # one hour in
+        top = replay.ranklist(10)
+        replay.step(60)             # one minute later
+
+    Scoring follows contest.type:
+    -   ICPC: problems solved, then penalty (minutes until accepted + 20 per rejected attempt).
+    -   CF: max(30%, points - points / 250 per minute - 50 per rejected attempt),
+        rejections on the first test don't count. Hacks are not replayed.
+    -   IOI: sum of the best points of each problem.
+    Final verdicts are used, so a solution which failed system tests never counts.
+
+    Parameter:
+    -   contest: 	Contest object.
+    -   problems: 	List of the contest's Problem objects.
+    -   submissions: 	Iterable of the contest's Submission objects.
+    -   types: 	participantTypes to rank, e.g. ('CONTESTANT', 'OUT_OF_COMPETITION').
+    """
+
+    IGNORED = {None, 'COMPILATION_ERROR', 'SKIPPED', 'TESTING', 'REJECTED'}
+
+    def __init__(self, contest, problems, submissions, types = ('CONTESTANT',)):
+        self.contest = contest
+        self.problems = problems
+        self.time = -1
+        self.parties = []       # Party objects, by party number
+        self._numbers = {}      # Party key -> party number
+        self._handles = {}      # Lowercase handle -> party number
+        self._points = {x.index: x.points or 0 for x in problems}
+        self._cells = {}        # (party number, problem index) -> (time, rejected, points, penalty)
+        self._totals = {}       # Party number -> (points, penalty) of the ranked parties
+        self._ranking = []      # Sorted (-points, penalty, party number) of the ranked parties
+        self._undo = []         # What the applied events overwrote, in order
+
+        events = []
+        for x in submissions:
+            if x.author.participantType not in types or x.relativeTimeSeconds >= contest.durationSeconds:
+                continue
+            if x.verdict in self.IGNORED or x.problem.index not in self._points:
+                continue
+            if contest.type == 'CF' and x.verdict != 'OK' and not x.passedTestCount:
+                continue
+
+            key = _object_party_key(x.author)
+            if key not in self._numbers:
+                self._numbers[key] = len(self.parties)
+                for handle in key[2]:
+                    self._handles.setdefault(handle.lower(), len(self.parties))
+                self.parties.append(x.author)
+            events.append((x.relativeTimeSeconds, x.id, self._numbers[key], x.problem.index, x.verdict == 'OK', x.points))
+        events.sort()
+        self._events = events
+
+    @classmethod
+    def fetch(cls, client, contestId, **kwargs):
+        """
+        Builds the replay of a contest from contest.standings (only its
+        header is read) and contest.status.
+        """
+
+        ok, result = client.contest_standings(contestId, **{'from': 1, 'count': 1})
+        if not ok:
+            return False, result
+        contest, problems, _ = result
+
+        ok, submissions = client.contest_status(contestId)
+        if not ok:
+            return False, submissions
+
+        return True, cls(contest, problems, submissions, **kwargs)
+
+    def seek(self, time):
+        """
+        Moves to time seconds after the start of the contest: every
+        submission made at or before it counts.
+        Return value: The list of Party objects whose result changed.
+        """
+
+        changed = set()
+        while len(self._undo) < len(self._events) and self._events[len(self._undo)][0] <= time:
+            self._apply(self._events[len(self._undo)], changed)
+        while self._undo and self._events[len(self._undo) - 1][0] > time:
+            self._revert(self._undo.pop(), changed)
+        self.time = time
+        return [self.parties[x] for x in sorted(changed)]
+
+    def step(self, seconds):
+        """
+        Same as seek(), relative to the current time.
+        """
+
+        return self.seek(self.time + seconds)
+
+    def rank_of(self, handle):
+        """
+        Returns the rank of the party of handle (shared by ties), or None
+        if it hasn't made a counted submission yet.
+        """
+
+        number = self._handles.get(handle.lower())
+        if number not in self._totals:
+            return None
+        points, penalty = self._totals[number]
+        return bisect.bisect_left(self._ranking, (-points, penalty)) + 1
+
+    def ranklist(self, count = None):
+        """
+        Returns the first count rows of the standings (all if None) as
+        RanklistRow objects, like contest_standings().
+        """
+
+        rows = []
+        rank = 0
+        previous = None
+        for i, (points, penalty, number) in enumerate(self._ranking[:count]):
+            if (points, penalty) != previous:
+                rank = i + 1
+                previous = (points, penalty)
+            results = []
+            for problem in self.problems:
+                cell = self._cells.get((number, problem.index))
+                results.append(ProblemResult(
+                    points=cell[2] if cell else 0.0,
+                    penalty=cell[3] if cell else 0,
+                    rejectedAttemptCount=cell[1] if cell else 0,
+                    type='FINAL',
+                    bestSubmissionTimeSeconds=cell[0] if cell and cell[2] else None,
+                ))
+            rows.append(RanklistRow(party=self.parties[number], rank=rank, points=-points, penalty=penalty,
+                                    successfulHackCount=0, unsuccessfulHackCount=0, problemResults=results))
+        return rows
+
+    def _score(self, cell, event):
+        # Returns the cell after the event
+        time, _, number, index, accepted, points = event
+        if cell is None:
+            cell = (None, 0, 0.0, 0)
+        kind = self.contest.type
+
+        if kind == 'IOI':
+            if points is None:
+                points = self._points[index] if accepted else 0.0
+            if points > cell[2]:
+                return (time, cell[1], points, 0)
+            return cell if accepted or points else (cell[0], cell[1] + 1, cell[2], cell[3])
+
+        if cell[2]:
+            return cell         # Already solved
+        if not accepted:
+            return (cell[0], cell[1] + 1, cell[2], cell[3])
+        if kind == 'CF':
+            maximum = self._points[index]
+            points = max(0.3 * maximum, maximum - maximum / 250 * (time // 60) - 50 * cell[1])
+            return (time, cell[1], points, 0)
+        return (time, cell[1], 1.0, time // 60 + 20 * cell[1])
+
+    def _apply(self, event, changed):
+        number, index = event[2], event[3]
+        old = self._cells.get((number, index))
+        new = self._score(old, event)
+        if new == old:
+            self._undo.append(None)
+            return
+
+        total = self._totals.get(number)
+        self._undo.append((number, index, old, total))
+        self._cells[(number, index)] = new
+        points, penalty = total or (0.0, 0)
+        if old is not None:
+            points -= old[2]
+            penalty -= old[3]
+        self._rerank(number, total, (points + new[2], penalty + new[3]))
+        changed.add(number)
+
+    def _revert(self, undo, changed):
+        if undo is None:
+            return
+
+        number, index, old, total = undo
+        if old is None:
+            del self._cells[(number, index)]
+        else:
+            self._cells[(number, index)] = old
+        self._rerank(number, self._totals.get(number), total)
+        changed.add(number)
+
+    def _rerank(self, number, old, new):
+        # Moves a party from its old total to its new one in the ranking
+        if old is not None:
+            del self._ranking[bisect.bisect_left(self._ranking, (-old[0], old[1], number))]
+        if new is None:
+            del self._totals[number]
+        else:
+            self._totals[number] = new
+            bisect.insort(self._ranking, (-new[0], new[1], number))
+
+class RatingIndex:
+    """
+    Rating distribution of the rated users, built once from user.ratedList
+    and kept up to date from contest.ratingChanges. Ratings are kept in
+    sorted NumPy arrays, so ranks and percentiles are binary searches.
+    Countries and organizations have sorted arrays of (group, rating) keys,
+    where each group is a contiguous slice:
+
+        index = RatingIndex(client)
+        index.build()
+        index.rank_of('tourist'), index.percentile(2100, country='Vietnam')
+        index.refresh(1843)         # after a contest
+
+    Parameter:
+    -   client: 	Client to fetch with.
+    -   activeOnly: 	Passed to user.ratedList. New users found by refresh() are
+                        added either way.
+    """
+
+    # Keys of the group arrays are group code << _SHIFT | (rating + _OFFSET)
+    _SHIFT = 20
+    _OFFSET = 1 << 19
+
+    def __init__(self, client, activeOnly = False):
+        if np is None:
+            raise ImportError('RatingIndex requires numpy')
+
+        self.client = client
+        self.activeOnly = activeOnly
+        self.contests = set()       # Ids of the contests applied by refresh()
+        self.histories = {}         # Lowercase handle -> list of RatingChange objects, see trajectories()
+        self.handles = []
+        self._ids = {}              # Lowercase handle -> position in handles
+        self._ratings = np.zeros(0, dtype=np.int64)
+        self._codes = {'country': np.zeros(0, dtype=np.int64), 'organization': np.zeros(0, dtype=np.int64)}
+        self._groups = {'country': {}, 'organization': {}}     # Group -> code
+        self._sorted = np.zeros(0, dtype=np.int64)
+        self._keys = {'country': np.zeros(0, dtype=np.int64), 'organization': np.zeros(0, dtype=np.int64)}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.handles)
+
+    def build(self):
+        """
+        Fetches user.ratedList (without building User objects) and indexes it.
+        """
+
+        ok, result = self.client.request('user.ratedList', activeOnly=self.activeOnly)
+        if not ok:
+            return False, result
+
+        with self._lock:
+            self.handles = [x['handle'] for x in result]
+            self._ids = {x.lower(): i for i, x in enumerate(self.handles)}
+            self._ratings = np.fromiter((x['rating'] for x in result), dtype=np.int64, count=len(result))
+            for field in self._codes:
+                groups = self._groups[field] = {}
+                self._codes[field] = np.fromiter((groups.setdefault(x.get(field) or None, len(groups)) for x in result),
+                                                 dtype=np.int64, count=len(result))
+            self._sorted = np.sort(self._ratings)
+            for field in self._keys:
+                self._keys[field] = np.sort(self._key(self._codes[field], self._ratings))
+        return True, len(self.handles)
+
+    def rating(self, handle):
+        """
+        Returns the rating of handle, or None if it isn't rated.
+        """
+
+        i = self._ids.get(handle.lower())
+        return None if i is None else int(self._ratings[i])
+
+    def rank(self, rating, country = None, organization = None):
+        """
+        Returns the rank of a rating: 1 + the number of users rated higher,
+        among every user or those of one country or organization. None if
+        there are no such users.
+        """
+
+        keys, lo, hi, base = self._slice(country, organization)
+        if lo == hi:
+            return None
+        return int(hi - np.searchsorted(keys, base + rating, 'right')) + 1
+
+    def rank_of(self, handle, country = None, organization = None):
+        """
+        Returns the rank of handle, see rank(), or None if it isn't rated.
+        """
+
+        rating = self.rating(handle)
+        return None if rating is None else self.rank(rating, country, organization)
+
+    def percentile(self, rating, country = None, organization = None):
+        """
+        Returns the percentage of users rated lower than rating.
+        """
+
+        keys, lo, hi, base = self._slice(country, organization)
+        if lo == hi:
+            return None
+        return 100 * int(np.searchsorted(keys, base + rating, 'left') - lo) / (hi - lo)
+
+    def rating_at(self, percentile, country = None, organization = None):
+        """
+        Returns the lowest rating above percentile percent of the users.
+        """
+
+        keys, lo, hi, base = self._slice(country, organization)
+        if lo == hi:
+            return None
+        return int(keys[lo + min(hi - lo - 1, int((hi - lo) * percentile / 100))] - base)
+
+    def histogram(self, bins = 100, country = None, organization = None):
+        """
+        Counts users per rating bin.
+        Return value: The counts and the bin edges, like numpy.histogram().
+        bins is either a bin width or an array of edges.
+        """
+
+        keys, lo, hi, base = self._slice(country, organization)
+        return np.histogram(keys[lo:hi] - base, self._edges(bins))
+
+    def histograms(self, by = 'country', bins = 100):
+        """
+        Counts users per rating bin for every country or organization at once.
+        Return value: A dict from group to its counts, and the bin edges.
+        """
+
+        edges = self._edges(bins)
+        groups = self._groups[by]
+        bin = np.clip(np.searchsorted(edges, self._ratings, 'right') - 1, 0, len(edges) - 2)
+        counts = np.bincount(self._codes[by] * (len(edges) - 1) + bin,
+                             minlength=len(groups) * (len(edges) - 1)).reshape(len(groups), len(edges) - 1)
+        return {group: counts[code] for group, code in groups.items()}, edges
+
+    def refresh(self, contestId):
+        """
+        Applies the rating changes of a contest, fetched from
+        contest.ratingChanges. Contests already applied are skipped.
+        Return value: The number of users whose rating changed.
+        """
+
+        if contestId in self.contests:
+            return True, 0
+
+        ok, result = self.client.request('contest.ratingChanges', contestId=contestId)
+        if not ok:
+            return False, result
+
+        return True, self.update(result, contestId)
+
+    def update(self, changes, contestId = None):
+        """
+        Applies rating changes given as the "result" field of
+        contest.ratingChanges. Users rated for the first time are added
+        without country and organization. Loaded histories get the change
+        appended.
+        Return value: The number of users whose rating changed.
+        """
+
+        with self._lock:
+            if contestId is not None:
+                if contestId in self.contests:
+                    return 0
+                self.contests.add(contestId)
+
+            ids = []
+            for x in changes:
+                handle = x['handle'].lower()
+                if handle not in self._ids:
+                    self._ids[handle] = len(self.handles)
+                    self.handles.append(x['handle'])
+                ids.append(self._ids[handle])
+                if handle in self.histories:
+                    self.histories[handle].append(RatingChange(**x))
+            if not ids:
+                return 0
+
+            # New users are added with a placeholder rating, which is removed
+            # from the sorted arrays like an old rating
+            added = len(self.handles) - len(self._ratings)
+            if added:
+                self._ratings = np.concatenate([self._ratings, np.zeros(added, dtype=np.int64)])
+                self._sorted = _insert_sorted(self._sorted, np.zeros(added, dtype=np.int64))
+                for field in self._codes:
+                    code = self._groups[field].setdefault(None, len(self._groups[field]))
+                    self._codes[field] = np.concatenate([self._codes[field], np.full(added, code, dtype=np.int64)])
+                    self._keys[field] = _insert_sorted(self._keys[field], self._key(np.full(added, code), np.zeros(added, dtype=np.int64)))
+
+            ids = np.array(ids, dtype=np.int64)
+            new = np.fromiter((x['newRating'] for x in changes), dtype=np.int64, count=len(changes))
+            old = self._ratings[ids]
+            self._ratings[ids] = new
+            self._sorted = _insert_sorted(_remove_sorted(self._sorted, old), new)
+            for field in self._keys:
+                codes = self._codes[field][ids]
+                keys = _remove_sorted(self._keys[field], self._key(codes, old))
+                self._keys[field] = _insert_sorted(keys, self._key(codes, new))
+        return len(ids)
+
+    def trajectories(self, handles, max_workers = 4):
+        """
+        Fetches the rating history of many handles concurrently, within the
+        client's rate limit. Histories already loaded are not fetched again,
+        and refresh() keeps them up to date.
+        Return value: A dict from handle to its list of RatingChange
+        objects, and a dict from handle to the comment of each failed call.
+        """
+
+        def fetch(handle):
+            ok, result = self.client.request('user.rating', handle=handle)
+            return ok, [RatingChange(**x) for x in result] if ok else result
+
+        histories = {}
+        failed = {}
+        missing = [x for x in handles if x.lower() not in self.histories]
+        context = contextvars.copy_context()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            futures = {x: pool.submit(context.copy().run, fetch, x) for x in missing}
+            for handle, future in futures.items():
+                ok, result = future.result()
+                if ok:
+                    self.histories[handle.lower()] = result
+                else:
+                    failed[handle] = result
+        for handle in handles:
+            if handle.lower() in self.histories:
+                histories[handle] = self.histories[handle.lower()]
+        return True, (histories, failed)
+
+    def _key(self, codes, ratings):
+        return (codes << self._SHIFT) | (ratings + self._OFFSET)
+
+    def _slice(self, country, organization):
+        # Returns the sorted array holding the ratings of everyone or of one
+        # group, the slice [lo, hi) of the group and the key of rating 0
+        if country is not None and organization is not None:
+            raise ValueError('Give either country or organization')
+        if country is None and organization is None:
+            return self._sorted, 0, len(self._sorted), 0
+
+        field, group = ('country', country) if country is not None else ('organization', organization)
+        code = self._groups[field].get(group)
+        if code is None:
+            return self._sorted, 0, 0, 0
+        keys = self._keys[field]
+        lo = int(np.searchsorted(keys, code << self._SHIFT, 'left'))
+        hi = int(np.searchsorted(keys, (code + 1) << self._SHIFT, 'left'))
+        return keys, lo, hi, (code << self._SHIFT) + self._OFFSET
+
+    def _edges(self, bins):
+        if not np.isscalar(bins):
+            return np.asarray(bins)
+        if not len(self._sorted):
+            return np.array([0, bins])
+        lo = self._sorted[0] // bins * bins
+        return np.arange(lo, self._sorted[-1] + bins + 1, bins)
+
+def _remove_sorted(values, removed):
+    # Removes one occurrence of each of removed from the sorted array values
+    removed, counts = np.unique(removed, return_counts=True)
+    starts = np.searchsorted(values, removed, 'left')
+    keep = np.ones(len(values), dtype=bool)
+    for start, count in zip(starts, counts):
+        keep[start:start + count] = False
+    return values[keep]
+
+def _insert_sorted(values, inserted):
+    inserted = np.sort(inserted)
+    return np.insert(values, np.searchsorted(values, inserted), inserted)
+
+class SubmissionSync:
+    """
+    Keeps a high-water mark (the newest known submission id) per handle,
+    so that refreshing a user only fetches the submissions made since the
+    last sync. user.status is read in small windows from the newest
+    submission on, and reading stops at the first known id; for most users
+    that is one request with count=window. The marks are stored in a
+    SQLite file, so they survive restarts.
+
+        sync = SubmissionSync(client, 'watermarks.db')
+        ok, new = sync.sync('tourist')
+
+    The first sync of a handle fetches its whole history.
+
+    Parameter:
+    -   client: 	CodeforcesClient to fetch with.
+    -   path: 	SQLite file for the marks. None keeps them in memory.
+    -   window: 	Number of submissions asked for by the first request. Each
+                    following request asks for twice as many.
+    """
+
+    def __init__(self, client, path = None, window = 10):
+        self.client = client
+        self.window = window
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ':memory:', timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS watermarks (handle TEXT PRIMARY KEY, id INTEGER)')
+
+    def watermark(self, handle):
+        """
+        Returns the newest known submission id of handle, or None.
+        """
+
+        with self._lock:
+            row = self._db.execute('SELECT id FROM watermarks WHERE handle = ?', (handle.lower(),)).fetchone()
+        return row and row[0]
+
+    def set_watermark(self, handle, id):
+        """
+        Sets the newest known submission id of handle, e.g. from another store.
+        """
+
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?)', (handle.lower(), id))
+
+    def sync(self, handle):
+        """
+        Fetches the submissions of handle made since the last sync and
+        moves its mark forward.
+        Return value: A list of the new Submission objects, sorted in
+        decreasing order of submission id.
+        """
+
+        last = self.watermark(handle)
+        if last is None:
+            ok, new = self.client.request('user.status', handle=handle)
+            if not ok:
+                return False, new
+        else:
+            new = []
+            seen = set()
+            start = 1
+            count = self.window
+            while True:
+                ok, result = self.client.request('user.status', handle=handle, **{'from': start, 'count': count})
+                if not ok:
+                    return False, result
+
+                known = False
+                for x in result:
+                    if x['id'] <= last:
+                        known = True
+                        break
+                    if x['id'] not in seen:
+                        seen.add(x['id'])
+                        new.append(x)
+                if known or len(result) < count:
+                    break
+                start += count
+                count *= 2
+
+        if new:
+            self.set_watermark(handle, new[0]['id'])
+        elif last is None:
+            self.set_watermark(handle, 0)
+        return True, [Submission(**x) for x in new]
+
+    def sync_many(self, handles, max_workers = 4):
+        """
+        Syncs many handles concurrently, within the client's rate limit.
+        Return value: A dict from handle to the list of its new Submission
+        objects, and a dict from handle to the comment of each failed sync.
+        """
+
+        context = contextvars.copy_context()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+            futures = {x: pool.submit(context.copy().run, self.sync, x) for x in handles}
+            new = {}
+            failed = {}
+            for handle, future in futures.items():
+                ok, result = future.result()
+                if ok:
+                    new[handle] = result
+                else:
+                    failed[handle] = result
+        return True, (new, failed)
+
+class ProblemCatalog:
+    """
+    Indexed copy of problemset.problems. Problems are looked up by
+    (contestId, index) together with their solvedCount, by tag through an
+    inverted index and by rating through a sorted index, so queries don't
+    scan the whole problemset:
+
+        catalog = ProblemCatalog(client)
+        catalog.refresh()
+        problems = catalog.query(tags=['dp', 'greedy'], min_rating=1600, max_rating=1900)
+
+    refresh() can be called again later; it only indexes the problems which
+    are new or whose rating or tags changed, and updates every solvedCount.
+
+    Parameter:
+    -   client: 	Client to fetch with. Can be None if the catalog is only
+                    filled with update().
+    """
+
+    def __init__(self, client = None, **kwargs):
+        self.client = client
+        self.params = kwargs
+        self.problems = {}      # (contestId, index) -> Problem
+        self.solvedCount = {}   # (contestId, index) -> Integer
+        self._tags = collections.defaultdict(set)   # Tag -> set of (contestId, index)
+        self._ratings = []      # Sorted ratings of the rated problems
+        self._rated = []        # (contestId, index) of the problem with the rating at the same position
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.problems)
+
+    def __contains__(self, key):
+        return key in self.problems
+
+    def refresh(self):
+        """
+        Fetches problemset.problems and updates the catalog.
+        Return value: A list of the Problem objects which were added or changed.
+        """
+
+        ok, result = self.client.request('problemset.problems', **self.params)
+        if not ok:
+            return False, result
+
+        return True, self.update(result)
+
+    def update(self, result):
+        """
+        Updates the catalog from the undecoded result of problemset.problems.
+        Return value: A list of the Problem objects which were added or changed.
+        """
+
+        changed = []
+        with self._lock:
+            for x in result['problems']:
+                key = (x.get('contestId'), x['index'])
+                old = self.problems.get(key)
+                if old is not None and old.rating == x.get('rating') and old.tags == x.get('tags'):
+                    continue
+                if old is not None:
+                    self._unindex(key, old)
+                problem = self.problems[key] = Problem(**x)
+                self._index(key, problem)
+                changed.append(problem)
+
+            for x in result['problemStatistics']:
+                self.solvedCount[(x.get('contestId'), x['index'])] = x['solvedCount']
+        return changed
+
+    def get(self, contestId, index):
+        """
+        Returns the Problem and its solvedCount (None if unknown), or
+        (None, None) if there is no such problem.
+        """
+
+        key = (contestId, index)
+        return self.problems.get(key), self.solvedCount.get(key)
+
+    def tagged(self, *tags):
+        """
+        Returns the set of (contestId, index) of the problems having every tag.
+        """
+
+        sets = sorted((self._tags.get(x, set()) for x in tags), key=len)
+        if not sets:
+            return set(self.problems)
+        return sets[0].intersection(*sets[1:])
+
+    def rated(self, min_rating = None, max_rating = None):
+        """
+        Returns the (contestId, index) of the rated problems with
+        min_rating <= rating <= max_rating, in increasing order of rating.
+        """
+
+        lo = 0 if min_rating is None else bisect.bisect_left(self._ratings, min_rating)
+        hi = len(self._ratings) if max_rating is None else bisect.bisect_right(self._ratings, max_rating)
+        return self._rated[lo:hi]
+
+    def query(self, tags = (), min_rating = None, max_rating = None, exclude = (), limit = None):
+        """
+        Finds problems by tags and rating.
+        Return value: A list of Problem objects, most solved first.
+
+        Parameter:
+        -   tags: 	The problems must have every one of these tags.
+        -   min_rating, max_rating: 	Inclusive rating range. If either is given,
+                                        unrated problems are left out.
+        -   exclude: 	Set of (contestId, index) to leave out, e.g. problems already solved.
+        -   limit: 	Maximum number of problems returned.
+        """
+
+        if min_rating is None and max_rating is None:
+            keys = self.tagged(*tags)
+        else:
+            keys = self.rated(min_rating, max_rating)
+            if tags:
+                keys = self.tagged(*tags).intersection(keys)
+        keys = [x for x in keys if x not in exclude]
+        keys.sort(key=lambda x: self.solvedCount.get(x, 0), reverse=True)
+        return [self.problems[x] for x in keys[:limit]]
+
+    def _index(self, key, problem):
+        for tag in problem.tags or ():
+            self._tags[tag].add(key)
+        if problem.rating is not None:
+            i = bisect.bisect_right(self._ratings, problem.rating)
+            self._ratings.insert(i, problem.rating)
+            self._rated.insert(i, key)
+
+    def _unindex(self, key, problem):
+        for tag in problem.tags or ():
+            self._tags[tag].discard(key)
+        if problem.rating is not None:
+            i = bisect.bisect_left(self._ratings, problem.rating)
+            i = self._rated.index(key, i)
+            del self._ratings[i]
+            del self._rated[i]
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from codeforcesAPI import AsyncCodeforcesClient, CodeforcesClient, CircuitBreaker, Interner, ResponseCache, RatingIndex, StandingsTable, StandingsTracker, User, np
+
+
+class Handler(BaseHTTPRequestHandler):
+    bodies = []
+
+    def do_GET(self):
+        body = self.bodies.pop(0)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
+        self.breaker = CircuitBreaker(failures = 1, reset_timeout = 0.05)
+        self.client = CodeforcesClient(rate_limiter = None, retries = 0, circuit_breaker = self.breaker,
+                                       base_url = f'http://127.0.0.1:{self.server.server_port}/', output = 'dicts')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_unexpected_body_is_a_failure(self):
+        Handler.bodies = [{'weird': 1}, {'status': 'OK', 'result': [1]}]
+        self.assertEqual(self.client.call('contest.list'), (False, None))
+        self.assertEqual(self.breaker.state, 'open')
+
+        time.sleep(0.06)
+        self.assertEqual(self.client.call('contest.list'), (True, [1]))
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_lost_trial_call_is_given_up_on(self):
+        self.breaker.record(False)
+        time.sleep(0.06)
+        self.assertTrue(self.breaker.allow())   # The trial call never reports back
+        self.assertFalse(self.breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(self.breaker.allow())
+
+    def test_raising_call_opens_the_circuit(self):
+        def boom(*args):
+            raise RuntimeError('boom')
+        self.client._attempt = boom
+        with self.assertRaises(RuntimeError):
+            self.client.call('contest.list')
+        self.assertEqual(self.breaker.state, 'open')
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_invalidate_skips_none(self):
+        cache = ResponseCache(ttl = {'user.info': 60})
+        cache.put('user.info', {'handles': 'a', 'checkHistoricHandles': 'true'}, [1])
+        cache.invalidate('user.info', handles = 'a', checkHistoricHandles = True, lang = None)
+        self.assertEqual(cache.get('user.info', {'handles': 'a', 'checkHistoricHandles': 'true'}), (False, None))
+
+
+class StreamTest(unittest.TestCase):
+    def test_failed_download(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target = server.serve_forever, daemon = True).start()
+        client = CodeforcesClient(rate_limiter = None, base_url = f'http://127.0.0.1:{server.server_port}/')
+        Handler.bodies = [b'<html>maintenance</html>', {'status': 'OK', 'result': [1, 2]}]
+        self.assertEqual(client.stream('contest.list'), (False, None))
+        ok, stream = client.stream('contest.list')
+        self.assertEqual(list(stream.array_items()), [1, 2])
+        server.shutdown()
+        server.server_close()
+
+        self.assertEqual(client.stream('contest.list'), (False, None))
+
+    def test_truncated_standings(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target = server.serve_forever, daemon = True).start()
+        client = CodeforcesClient(rate_limiter = None, base_url = f'http://127.0.0.1:{server.server_port}/')
+        Handler.bodies = [b'{"status":"OK","result":{"contest":{"id":1},"problems":[{"ind']
+        self.assertEqual(client.stream_contest_standings(1), (False, None))
+        server.shutdown()
+        server.server_close()
+
+
+def empty_decoder(body):
+    return []
+
+
+class CrawlTest(unittest.TestCase):
+    def test_bad_body(self):
+        client = CodeforcesClient(rate_limiter = None)
+        client.call = lambda method, contestId: (True, b'[]' if contestId == 1 else b'<html>')
+        results = sorted(client.crawl_contests([1, 2], methods = ['contest.ratingChanges'], processes = 1))
+        self.assertEqual(results, [(1, 'contest.ratingChanges', True, []), (2, 'contest.ratingChanges', False, None)])
+
+    def test_client_decoder(self):
+        client = CodeforcesClient(rate_limiter = None, decoder = empty_decoder)
+        client.call = lambda method, contestId: (True, b'<html>')
+        results = list(client.crawl_contests([1], methods = ['contest.ratingChanges'], processes = 1))
+        self.assertEqual(results, [(1, 'contest.ratingChanges', True, [])])
+
+
+class UserInfoBulkTest(unittest.TestCase):
+    known = [f'user{i}' for i in range(100)]
+    handles = known[:20] + ['gone1'] + known[20:50] + ['gone2', 'gone3'] + known[50:]
+
+    def fake_call(self, method, build, params):
+        handles = params['handles'].split(';')
+        self.calls.append(handles)
+        gone = [x for x in handles if x.startswith('gone')]
+        if gone:
+            return False, f'handles: User with handle {gone[0].upper()} not found'
+        return True, [User(handle=x) for x in handles]
+
+    def check(self, ok, result):
+        self.assertTrue(ok)
+        users, unknown = result
+        self.assertEqual(sorted(users), sorted(self.known))
+        self.assertTrue(all(users[x].handle == x for x in users))
+        self.assertEqual(sorted(unknown), ['gone1', 'gone2', 'gone3'])
+        self.assertTrue(all(len(x) <= 52 for x in self.calls[1:]))
+
+    def test_unknown_handles(self):
+        self.calls = []
+        client = CodeforcesClient(rate_limiter = None)
+        client._call = self.fake_call
+        self.check(*client.user_info_bulk(self.handles))
+
+    def test_unknown_handles_async(self):
+        self.calls = []
+        async def fake_call(*args):
+            return self.fake_call(*args)
+        async def run():
+            async with AsyncCodeforcesClient(rate_limiter = None) as client:
+                client._call = fake_call
+                return await client.user_info_bulk(self.handles)
+        self.check(*asyncio.run(run()))
+
+
+class InternerTest(unittest.TestCase):
+    def test_ghosts(self):
+        interner = Interner()
+        ghost = lambda name: {'contestId': 1, 'members': [], 'participantType': 'CONTESTANT', 'ghost': True, 'teamName': name}
+        a, b, again = interner.party(ghost('A')), interner.party(ghost('B')), interner.party(ghost('A'))
+        self.assertIs(a, again)
+        self.assertEqual((a.teamName, b.teamName), ('A', 'B'))
+
+
+class StandingsTrackerTest(unittest.TestCase):
+    def test_ghosts(self):
+        ghost = lambda name, rank: {'party': {'contestId': 1, 'members': [], 'participantType': 'CONTESTANT', 'ghost': True, 'teamName': name},
+                                    'rank': rank, 'points': 0.0, 'penalty': 0, 'problemResults': []}
+        tracker = StandingsTracker(None, 1)
+        result = {'contest': {'id': 1}, 'problems': [], 'rows': [ghost('A', 1), ghost('B', 2), ghost('C', 3)]}
+        self.assertEqual([x[0] for x in tracker.apply(result)], [None, None, None])
+        self.assertEqual([x.party.teamName for x in tracker.ranklist()], ['A', 'B', 'C'])
+        self.assertEqual(tracker.apply(result), [])
+
+
+class Fixed:
+    def __init__(self, **results):
+        self.results = results
+
+    def request(self, method, **params):
+        return True, self.results[method]
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class RatingIndexTest(unittest.TestCase):
+    def test_unknown_group(self):
+        index = RatingIndex(Fixed(**{'user.ratedList': [{'handle': 'a', 'rating': 2000, 'country': 'Vietnam'},
+                                                        {'handle': 'b', 'rating': 1500}]}))
+        index.build()
+        self.assertEqual(index.rank(1800), 2)
+        self.assertEqual(index.rank(1800, country='Vietnam'), 2)
+        self.assertIsNone(index.rank(1800, country='Atlantis'))
+        self.assertIsNone(index.rank_of('a', organization='Atlantis'))
+
+
+@unittest.skipIf(np is None, 'requires numpy')
+class StandingsTableTest(unittest.TestCase):
+    def test_no_problems(self):
+        row = {'party': {'members': [{'handle': 'a'}], 'participantType': 'CONTESTANT'},
+               'rank': 1, 'points': 0.0, 'penalty': 0, 'problemResults': []}
+        table = StandingsTable.from_json({'contest': {'id': 1}, 'problems': [], 'rows': [row]})
+        self.assertEqual(table.columns['problemPoints'].shape, (1, 0))
+        table = StandingsTable.from_json({'contest': {'id': 1}, 'problems': [{'index': 'A'}], 'rows': []})
+        self.assertEqual(table.columns['problemPoints'].shape, (0, 1))
+
+    def test_team_row(self):
+        row = {'party': {'members': [{'handle': 'x'}, {'handle': 'y'}], 'participantType': 'CONTESTANT',
+                         'teamId': 7, 'teamName': 'Team X'},
+               'rank': 1, 'points': 1.0, 'penalty': 20, 'problemResults': [{'points': 1.0, 'rejectedAttemptCount': 0}]}
+        table = StandingsTable.from_json({'contest': {'id': 1}, 'problems': [{'index': 'A'}], 'rows': [row]})
+        party = table.row(0).party
+        self.assertEqual([x.handle for x in party.members], ['x', 'y'])
+        self.assertEqual((party.teamId, party.teamName, party.ghost), (7, 'Team X', False))
+        self.assertEqual(table.rank_of('Team X'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()